@@ -0,0 +1,218 @@
+from typing import List, Dict, Any, Optional, Tuple
+
+# A value range (lo, hi); hi is None when there is no known upper bound
+Range = Tuple[int, Optional[int]]
+State = Dict[str, Range]
+
+# Nothing is known about the variables except that they are never negative
+UNKNOWN = {'GROOT': (0, None), 'groot': (0, None)}
+
+def _join(a: State, b: State) -> State:
+    """Smallest ranges covering both states"""
+    joined = {}
+    for var in a:
+        (lo1, hi1), (lo2, hi2) = a[var], b[var]
+        hi = None if hi1 is None or hi2 is None else max(hi1, hi2)
+        joined[var] = (min(lo1, lo2), hi)
+    return joined
+
+def _add(a: Optional[int], b: Optional[int]) -> Optional[int]:
+    return None if a is None or b is None else a + b
+
+# Bounds past this are widened so the analysis never does bigint arithmetic
+BOUND_LIMIT = 1 << 62
+
+def _widen(lo: int, hi: Optional[int]) -> Range:
+    """Loosen a range whose bounds have grown past BOUND_LIMIT"""
+    if lo > BOUND_LIMIT or (hi is not None and hi > BOUND_LIMIT):
+        return (min(lo, BOUND_LIMIT), None)
+    return (lo, hi)
+
+# Functions with at most this many straight-line statements are inlined
+INLINE_LIMIT = 8
+STRAIGHT_LINE = ('INCREMENT', 'DECREMENT', 'PRINT', 'ASSIGN', 'ADD', 'SUBTRACT')
+# Statements that may raise, which a call inside try/catch would roll back
+FALLIBLE = ('DECREMENT', 'SUBTRACT')
+REWRITABLE = FALLIBLE + ('TRY_CATCH',)
+
+def _split_return(body: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """A function body up to its RETURN, and the variable it returns"""
+    for index, stmt in enumerate(body):
+        if stmt['type'] == 'RETURN':
+            return body[:index], stmt['variable']
+    return list(body), None
+
+class RangeAnalysis:
+    """
+    Static value-range analysis for Groot programs.
+    Small functions are first inlined at their call sites. The analysis then
+    proves lower (and upper) bounds on GROOT and groot at every point, so
+    decrements and subtractions that cannot go negative run unchecked and
+    top-level try/catch blocks whose body cannot fail become straight-line code.
+    The rewritten program prints exactly what the original would.
+    """
+    def __init__(self, functions: Dict[int, Dict[str, Any]]):
+        self.functions = functions
+        self.calls_in_progress = 0
+        # Function name -> (body, returned variable, can fail), None if not inlinable
+        self.inlinable = {}
+
+    def optimize(self, statements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Rewrite top-level statements; the variables may hold any value on entry"""
+        if self.functions:
+            statements = self._inline(statements)
+        # Only checked arithmetic and try/catch blocks can be rewritten
+        if not any(stmt['type'] in REWRITABLE for stmt in statements):
+            return statements
+        optimized, _, _, _ = self._block(statements, dict(UNKNOWN), track_seen=False)
+        return self._lower(optimized)
+
+    def _inline(self, statements: List[Dict[str, Any]], in_try: bool = False) -> List[Dict[str, Any]]:
+        """
+        Replace calls to small straight-line functions with their body.
+        Inside try/catch a failing call rolls the variables back, which inlined
+        code would not, so there only bodies that cannot fail are inlined.
+        """
+        inlined = []
+        for stmt in statements:
+            if stmt['type'] in ('FUNCTION_CALL', 'FUNC_ASSIGN'):
+                body = self._inline_call(stmt, in_try)
+                if body is not None:
+                    inlined.extend(body)
+                    continue
+            elif stmt['type'] == 'TRY_CATCH':
+                stmt = dict(stmt, try_body=self._inline(stmt['try_body'], True),
+                            catch_body=self._inline(stmt['catch_body'], True))
+            inlined.append(stmt)
+        return inlined
+
+    def _inline_call(self, stmt: Dict[str, Any], in_try: bool) -> Optional[List[Dict[str, Any]]]:
+        """The statements a call expands to, or None to keep the call"""
+        name = stmt['function']
+        if name not in self.inlinable:
+            function = self.functions.get(name)
+            body, returned = _split_return(function['body']) if function else ([], None)
+            if function is None or len(body) > INLINE_LIMIT or any(s['type'] not in STRAIGHT_LINE for s in body):
+                self.inlinable[name] = None
+            else:
+                self.inlinable[name] = (body, returned, any(s['type'] in FALLIBLE for s in body))
+        if self.inlinable[name] is None:
+            return None
+        body, returned, can_fail = self.inlinable[name]
+        if in_try and can_fail:
+            return None
+        if stmt['type'] == 'FUNC_ASSIGN':
+            if returned is None:
+                return None
+            if returned != stmt['variable']:
+                return body + [{'type': 'ASSIGN', 'left': stmt['variable'], 'right': returned}]
+        return body
+
+    def _lower(self, statements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Inline top-level try/catch blocks whose body cannot fail.
+        Only valid outside any try block, where a failure would be reported
+        in place rather than caught.
+        """
+        lowered = []
+        for stmt in statements:
+            if stmt['type'] == 'TRY_CATCH' and stmt.get('safe'):
+                lowered.extend(self._lower(stmt['try_body']))
+                if any(s['type'] == 'ERROR_OUTPUT' for s in stmt['catch_body']):
+                    lowered.append({'type': 'SUCCESS_OUTPUT'})
+            else:
+                lowered.append(stmt)
+        return lowered
+
+    def _block(self, statements: List[Dict[str, Any]], state: State,
+               track_seen: bool = True) -> Tuple[List[Dict[str, Any]], State, bool, State]:
+        """
+        Analyze a statement list.
+        Returns (rewritten statements, state at the end, whether any statement
+        can fail, join of every state seen along the way). The top level and
+        called function bodies have no use for the joined states and skip
+        tracking them.
+        """
+        optimized = []
+        can_fail = False
+        seen = state
+        for stmt in statements:
+            before = state
+            replacement, state, fails, inner_seen = self._statement(stmt, state)
+            optimized.extend(replacement)
+            can_fail = can_fail or fails
+            if track_seen:
+                # The state before the statement is already covered by seen
+                if inner_seen is not before:
+                    seen = _join(seen, inner_seen)
+                seen = _join(seen, state)
+        return optimized, state, can_fail, seen
+
+    def _statement(self, stmt: Dict[str, Any], state: State) -> Tuple[List[Dict[str, Any]], State, bool, State]:
+        """Transfer function for a single statement, same result shape as _block"""
+        stype = stmt['type']
+        before = state
+        state = dict(state)
+        if stype == 'INCREMENT':
+            lo, hi = state[stmt['variable']]
+            state[stmt['variable']] = _widen(lo + 1, _add(hi, 1))
+        elif stype == 'DECREMENT':
+            lo, hi = state[stmt['variable']]
+            if lo >= 1:
+                state[stmt['variable']] = (lo - 1, _add(hi, -1))
+                return [{'type': 'DECREMENT_UNCHECKED', 'variable': stmt['variable']}], state, False, before
+            # A failed decrement leaves the variable at 0
+            state[stmt['variable']] = (max(lo - 1, 0), hi)
+            return [stmt], state, True, before
+        elif stype == 'ASSIGN':
+            state[stmt['left']] = state[stmt['right']]
+        elif stype == 'ADD':
+            (lo1, hi1), (lo2, hi2) = state[stmt['left']], state[stmt['right']]
+            state[stmt['left']] = _widen(lo1 + lo2, _add(hi1, hi2))
+        elif stype == 'SUBTRACT':
+            (lo1, hi1), (lo2, hi2) = state[stmt['left']], state[stmt['right']]
+            if stmt['left'] == stmt['right']:
+                state[stmt['left']] = (0, 0)
+            elif hi2 is not None and lo1 >= hi2:
+                state[stmt['left']] = (lo1 - hi2, _add(hi1, -lo2))
+            else:
+                # A failed subtraction leaves the variable unchanged
+                state[stmt['left']] = (0, hi1)
+                return [stmt], state, True, before
+            return [{'type': 'SUBTRACT_UNCHECKED', 'left': stmt['left'], 'right': stmt['right']}], state, False, before
+        elif stype in ('FUNCTION_CALL', 'FUNC_ASSIGN'):
+            state, can_fail, seen = self._call(stmt, state)
+            return [stmt], state, can_fail, seen
+        elif stype == 'TRY_CATCH':
+            return self._try_catch(stmt, state)
+        # PRINT, RETURN and nested declarations leave the variables alone
+        return [stmt], state, False, before
+
+    def _call(self, stmt: Dict[str, Any], state: State) -> Tuple[State, bool, State]:
+        """Follow a call through the function body (which itself is not rewritten)"""
+        function = self.functions.get(stmt['function'])
+        if function is None:
+            return state, True, state
+        if self.calls_in_progress:
+            # Recursion: give up on the variables
+            return dict(UNKNOWN), True, dict(UNKNOWN)
+        self.calls_in_progress += 1
+        body, returned = _split_return(function['body'])
+        _, end, can_fail, _ = self._block(body, state, track_seen=False)
+        self.calls_in_progress -= 1
+        if stmt['type'] == 'FUNC_ASSIGN':
+            end = dict(end)
+            end[stmt['variable']] = end[returned] if returned else (0, 0)
+        # A failing call inside try/catch rolls back to the state before the call
+        return end, can_fail, _join(state, end)
+
+    def _try_catch(self, stmt: Dict[str, Any], state: State) -> Tuple[List[Dict[str, Any]], State, bool, State]:
+        """Analyze both branches; a body that cannot fail marks the block safe"""
+        try_body, try_end, try_fails, try_seen = self._block(stmt['try_body'], state)
+        if not try_fails:
+            return [dict(stmt, try_body=try_body, safe=True)], try_end, False, try_seen
+
+        # The catch block starts from whichever state the try body failed in
+        catch_body, catch_end, catch_fails, catch_seen = self._block(stmt['catch_body'], try_seen)
+        rewritten = dict(stmt, try_body=try_body, catch_body=catch_body)
+        return [rewritten], _join(try_end, catch_end), catch_fails, _join(try_seen, catch_seen)
@@ -1,6 +1,12 @@
-from flask import Flask, render_template, request, jsonify, session
-from parser import GrootParser
+from flask import Flask, Response, render_template, request, jsonify, session
 from interpreter import GrootInterpreter
+from metrics import Metrics
+from incremental import IncrementalParser
+from sessions import SessionCaches
+from scheduler import Scheduler, Overloaded, estimate_cost
+from responses import PrecomputedResponse
+import threading
+import time
 import uuid
 
 app = Flask(__name__)
@@ -9,102 +15,37 @@ app.secret_key = 'groot-secret-key-change-in-production'
 # Store interpreter instances per session
 interpreters = {}
 
-def get_interpreter():
-    """Get or create interpreter instance for current session"""
-    session_id = session.get('session_id')
-    if not session_id:
-        session_id = str(uuid.uuid4())
-        session['session_id'] = session_id
-    
-    if session_id not in interpreters:
-        interpreters[session_id] = GrootInterpreter()
-    
-    return interpreters[session_id]
+# Per-session lock, held while the session's parser (or the AST it patches
+# in place) and interpreter are in use. Kept next to the interpreters rather
+# than in the evictable program caches, so evicting a session mid-run never
+# hands its next request a fresh lock
+session_locks = {}
 
-@app.route('/')
-def index():
-    """Main page with the interpreter interface"""
-    return render_template('index.html')
+def drop_program(session_id: str):
+    """Eviction hook: the interpreter's copy of the program goes with the rest"""
+    interpreter = interpreters.get(session_id)
+    if interpreter is not None:
+        interpreter.drop_caches()
 
-@app.route('/execute', methods=['POST'])
-def execute_code():
-    """Execute Groot code and return results"""
-    try:
-        data = request.get_json()
-        code = data.get('code', '').strip()
-        
-        if not code:
-            return jsonify({'error': 'No code provided'})
-        
-        # Get parser and interpreter
-        parser = GrootParser()
-        interpreter = get_interpreter()
-        
-        # Capture output
-        output = []
-        original_print = print
-        
-        def capture_print(*args, **kwargs):
-            output.append(' '.join(str(arg) for arg in args))
-        
-        # Temporarily replace print function
-        import builtins
-        builtins.print = capture_print
-        
-        try:
-            # Parse and execute code
-            tokens = parser.tokenize(code)
-            if tokens:
-                ast = parser.parse(tokens)
-                interpreter.interpret(ast)
-            
-            # Get variable state
-            state = interpreter.get_variable_state()
-            
-            return jsonify({
-                'success': True,
-                'output': '\n'.join(output) if output else '',
-                'variables': state
-            })
-            
-        except Exception as e:
-            return jsonify({
-                'success': False,
-                'error': f"Error: {str(e)}",
-                'variables': interpreter.get_variable_state()
-            })
-        
-        finally:
-            # Restore original print function
-            builtins.print = original_print
-            
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': f"Server error: {str(e)}"
-        })
+# Incremental parser, cost estimate and prefix-state index of each session's
+# last program, for the most recently active sessions only
+programs = SessionCaches(on_evict=drop_program)
 
-@app.route('/reset', methods=['POST'])
-def reset_interpreter():
-    """Reset the interpreter state"""
-    try:
-        interpreter = get_interpreter()
-        interpreter.reset()
-        return jsonify({
-            'success': True,
-            'variables': interpreter.get_variable_state()
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': f"Error resetting: {str(e)}"
-        })
+# Admission control: runs wait for an execution slot, cheapest first
+scheduler = Scheduler()
 
-@app.route('/examples')
-def get_examples():
-    """Get example Groot programs"""
-    examples = {
-        'Hello World': '''# Your first Groot program!
+# Per-phase latency, statement and error counters, served on /metrics
+metrics = Metrics()
+metrics.gauge('groot_interpreters', 'Live interpreter sessions', lambda: len(interpreters))
+metrics.gauge('groot_cached_programs', 'Sessions whose program is cached for incremental parsing', lambda: len(programs))
+metrics.gauge('groot_cached_lines', 'Source lines held by cached programs', lambda: programs.lines)
+metrics.gauge('groot_queued_cost', 'Estimated cost of running and waiting programs', lambda: scheduler.queued_cost)
+metrics.gauge('groot_waiting_requests', 'Programs waiting for an execution slot', lambda: len(scheduler.waiting))
+metrics.gauge('groot_rejected_requests', 'Programs turned away with 429 since start', lambda: scheduler.rejected)
+
+# Example programs served on /examples
+EXAMPLES = {
+    'Hello World': '''# Your first Groot program!
 # This increments GROOT 6 times and prints it
 I am GROOT!
 I am GROOT!
@@ -112,8 +53,8 @@ I am GROOT!
 I am GROOT!
 I am GROOT!
 I am GROOT''',
-        
-        'Variables': '''# Working with both variables
+    
+    'Variables': '''# Working with both variables
 # Increment GROOT 3 times
 I am GROOT!
 I am GROOT!
@@ -126,8 +67,8 @@ I am groot!
 # Print both values
 I am GROOT
 I am groot''',
-        
-        'Assignment': '''# Variable assignment
+    
+    'Assignment': '''# Variable assignment
 I am GROOT!
 I am GROOT!
 I am GROOT!
@@ -137,8 +78,8 @@ I am groot, I am GROOT
 
 # Print groot (should be 3)
 I am groot''',
-        
-        'Arithmetic': '''# Simple arithmetic
+    
+    'Arithmetic': '''# Simple arithmetic
 I am GROOT!
 I am GROOT!
 I am GROOT!
@@ -149,8 +90,8 @@ I am groot! I am GROOT
 
 # Print result
 I am groot''',
-        
-        'Functions': '''# Function definition
+    
+    'Functions': '''# Function definition
 I am... Groot,
     I am GROOT!
     I am GROOT!
@@ -162,7 +103,7 @@ I am groot, I am... Groot
 # Print result
 I am groot''',
 
-        'Complete Example': '''# Complete Groot program with functions and control flow
+    'Complete Example': '''# Complete Groot program with functions and control flow
 I am GROOT!
 I am GROOT!
 I am GROOT!
@@ -179,9 +120,234 @@ I am groot, I am... Groot
 # Print results
 I am GROOT
 I am groot'''
-    }
+}
+
+# The page and the examples never change while the app runs, so both are
+# rendered, serialized and compressed once, on first use. The page is
+# revalidated on every load (a cheap 304); the examples may be reused for an hour.
+index_response = PrecomputedResponse(
+    lambda: render_template('index.html').encode(), 'text/html', 'no-cache'
+)
+examples_response = PrecomputedResponse(
+    lambda: app.json.response(EXAMPLES).get_data(), 'application/json', 'public, max-age=3600'
+)
+
+def warm_up():
+    """
+    Do the work a cold instance would otherwise put on its first requests:
+    render and compress the static responses and run a small program
+    through every stage of the execution pipeline.
+    """
+    from state_index import StateIndex
+    with app.app_context():
+        index_response.warm()
+        examples_response.warm()
+    parser = IncrementalParser()
+    tokens = parser.tokenize(EXAMPLES['Complete Example'])
+    ast = parser.parse(tokens)
+    estimate_cost(ast)
+    interpreter = GrootInterpreter(output=lambda line: None)
+    interpreter.interpret(ast)
+    StateIndex(parser).state_at(len(parser.lines))
+
+def get_session_id():
+    """Get or create the id of the current session"""
+    session_id = session.get('session_id')
+    if not session_id:
+        session_id = str(uuid.uuid4())
+        session['session_id'] = session_id
+    return session_id
+
+def get_interpreter(session_id: str = None):
+    """Get or create interpreter instance for current session"""
+    session_id = session_id or get_session_id()
+    
+    if session_id not in interpreters:
+        interpreters[session_id] = GrootInterpreter()
+    
+    return interpreters[session_id]
+
+def get_session_lock(session_id: str) -> threading.Lock:
+    """The session's lock, created on first use"""
+    return session_locks.setdefault(session_id, threading.Lock())
+
+def get_parser(session_id: str = None):
+    """Get or create the incremental parser for current session"""
+    session_id = session_id or get_session_id()
+    return programs.get(session_id).parser
+
+@app.route('/')
+def index():
+    """Main page with the interpreter interface"""
+    return index_response.serve(request)
+
+def get_cost(session_id: str, ast, interpreter) -> int:
+    """Estimated cost of the session's program, cached until it changes"""
+    program = programs.get(session_id)
+    cached = program.cost
+    if cached is None or cached[0] is not ast:
+        cached = program.cost = (ast, estimate_cost(ast, interpreter.functions))
+    return cached[1]
+
+def run_program(session_id: str, code: str):
+    """
+    Run code in a session; shared by the Flask route and the ASGI front end
+    (asgi.py) so both answer with the same JSON.
+    Returns (payload, status, extra headers).
+    """
+    interpreter = get_interpreter(session_id)
     
-    return jsonify(examples)
+    # The program's output, one entry per printed line
+    output = []
+    
+    try:
+        # Parse and execute code, timing each phase. The parser patches the
+        # AST in place, so /state-at waits until the run is over
+        with get_session_lock(session_id), metrics.counting(interpreter):
+            # Get the parser once the lock is held, in case the session was
+            # evicted meanwhile (the parser keeps the previous buffer, so only
+            # the edited lines are re-tokenized and re-parsed)
+            parser = programs.get(session_id).parser
+            interpreter.output = output.append
+            try:
+                with metrics.time('tokenize'):
+                    tokens = parser.tokenize(code)
+                programs.weigh(session_id)
+                if tokens:
+                    with metrics.time('parse'):
+                        ast = parser.parse(tokens)
+                    # Wait for an execution slot; raises Overloaded when full
+                    queued_at = time.perf_counter()
+                    with scheduler.admit(get_cost(session_id, ast, interpreter)):
+                        metrics.observe('queue', time.perf_counter() - queued_at)
+                        with metrics.time('interpret'):
+                            interpreter.interpret(ast)
+            finally:
+                # Let go of this request's output list once the run is over
+                interpreter.output = print
+        
+        # Get variable state
+        state = interpreter.get_variable_state()
+        
+        return {
+            'success': True,
+            'output': '\n'.join(output) if output else '',
+            'variables': state
+        }, 200, {}
+
+    except Overloaded as e:
+        return overloaded(session_id, e)
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': f"Error: {str(e)}",
+            'variables': interpreter.get_variable_state()
+        }, 200, {}
+
+def overloaded(session_id: str, error: Overloaded):
+    """The 429 answer to a run turned away by admission control, as run_program returns it"""
+    return {
+        'success': False,
+        'error': f"Server busy: try again in {error.retry_after}s",
+        'variables': get_interpreter(session_id).get_variable_state()
+    }, 429, {'Retry-After': str(error.retry_after)}
+
+def reset_session(session_id: str) -> dict:
+    """Reset a session's interpreter; shared with the ASGI front end"""
+    try:
+        interpreter = get_interpreter(session_id)
+        interpreter.reset()
+        return {
+            'success': True,
+            'variables': interpreter.get_variable_state()
+        }
+    except Exception as e:
+        return {
+            'success': False,
+            'error': f"Error resetting: {str(e)}"
+        }
+
+@app.route('/execute', methods=['POST'])
+def execute_code():
+    """Execute Groot code and return results"""
+    try:
+        data = request.get_json()
+        code = data.get('code', '').strip()
+        
+        if not code:
+            return jsonify({'error': 'No code provided'})
+        
+        payload, status, headers = run_program(get_session_id(), code)
+        with metrics.time('serialize'):
+            response = jsonify(payload)
+        response.status_code = status
+        response.headers.update(headers)
+        return response
+            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f"Server error: {str(e)}"
+        })
+
+@app.route('/warmup')
+def warmup():
+    """Warm-up hook for schedulers and health checks to hit after a cold start"""
+    warm_up()
+    return '', 204
+
+@app.route('/metrics')
+def get_metrics():
+    """Prometheus metrics for the execution pipeline"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+def session_state_at(session_id: str, code: str, line: int) -> dict:
+    """Variables after line of a session's program, without running it; shared with asgi.py"""
+    from state_index import StateIndex
+
+    # Strip the code as /execute does, so the parser's buffer matches
+    # between the two; line is counted in the unstripped editor text
+    stripped = code.lstrip()
+    offset = code[:len(code) - len(stripped)].count('\n')
+    code = stripped.rstrip()
+
+    with get_session_lock(session_id):
+        program = programs.get(session_id)
+        program.parser.tokenize(code)
+        programs.weigh(session_id)
+        cached = program.state_index
+        if cached is None or cached[0] is not program.parser.ast:
+            cached = program.state_index = (program.parser.ast, StateIndex(program.parser))
+
+    return {
+        'success': True,
+        'line': line,
+        'variables': cached[1].state_at(line - offset)
+    }
+
+@app.route('/state-at', methods=['POST'])
+def state_at():
+    """Get the variable values after a given line without running the program"""
+    try:
+        data = request.get_json()
+        return jsonify(session_state_at(get_session_id(), data.get('code', ''), int(data.get('line', 0))))
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f"Error: {str(e)}"
+        })
+
+@app.route('/reset', methods=['POST'])
+def reset_interpreter():
+    """Reset the interpreter state"""
+    return jsonify(reset_session(get_session_id()))
+
+@app.route('/examples')
+def get_examples():
+    """Get example Groot programs"""
+    return examples_response.serve(request)
 
 if __name__ == '__main__':
+    warm_up()
     app.run(debug=True, host='0.0.0.0', port=8946)
@@ -0,0 +1,289 @@
+"""
+asyncio/ASGI front end for the web app's interactive routes:
+/, /execute, /state-at, /reset and /examples.
+
+Connections, including slow clients still sending or reading, cost one
+coroutine rather than a worker thread. Tokenizing, parsing and running a
+program happen on a thread pool through the same code as the Flask routes,
+so the JSON is identical and the admission control in scheduler.py still
+applies; once the pool's own backlog is as long as the scheduler's waiting
+limit, further runs get the same 429 answer instead of queueing unseen.
+Requests from one session are handled one at a time, in order.
+Sessions use Flask's signed cookie, so the two front ends can serve the
+same users side by side.
+
+    uvicorn asgi:application --port 8946
+"""
+
+import asyncio
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
+from werkzeug.exceptions import BadRequest, UnsupportedMediaType
+from werkzeug.http import dump_cookie, parse_cookie
+from scheduler import Overloaded
+from app import (app, scheduler, metrics, index_response, examples_response,
+                 run_program, overloaded, session_state_at, reset_session, warm_up)
+
+# Enough threads for every running and every waiting program, so waiting
+# for an execution slot happens inside the scheduler, where cheap runs go first
+THREADS = scheduler.slots + scheduler.max_waiting
+executor = ThreadPoolExecutor(max_workers=THREADS, thread_name_prefix='groot-run')
+# Jobs may queue behind busy threads, where the scheduler cannot see them, up
+# to its own waiting limit; past that they get its 429 answer straight away
+MAX_IN_FLIGHT = THREADS + scheduler.max_waiting
+# Jobs handed to the executor and not yet finished
+in_flight = 0
+in_flight_lock = threading.Lock()
+
+Headers = List[Tuple[bytes, bytes]]
+
+class SessionLock:
+    """Lock held while one of a session's requests uses its interpreter"""
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        # Requests holding or waiting for the lock; dropped from session_locks at 0
+        self.users = 0
+
+session_locks: Dict[str, SessionLock] = {}
+
+class Session:
+    """The session_id in Flask's signed session cookie"""
+    serializer = app.session_interface.get_signing_serializer(app)
+    cookie_name = app.session_interface.get_cookie_name(app)
+
+    def __init__(self, headers: Dict[bytes, bytes]):
+        self.data = {}
+        self.accessed = False
+        self.modified = False
+        cookie = parse_cookie(headers.get(b'cookie', b'').decode('latin-1')).get(self.cookie_name)
+        if cookie:
+            try:
+                self.data = self.serializer.loads(
+                    cookie, max_age=int(app.permanent_session_lifetime.total_seconds())
+                )
+            except Exception:
+                # Bad signature or expired: start a new session, as Flask does
+                self.data = {}
+
+    @property
+    def id(self) -> str:
+        """Get or create the id of the session"""
+        self.accessed = True
+        if not self.data.get('session_id'):
+            self.data['session_id'] = str(uuid.uuid4())
+            self.modified = True
+        return self.data['session_id']
+
+    def headers(self) -> Headers:
+        """Vary once the session is used, and Set-Cookie for a new session, as Flask sends them"""
+        if not self.accessed:
+            return []
+        if not self.modified:
+            return [(b'vary', b'Cookie')]
+        interface = app.session_interface
+        value = dump_cookie(
+            self.cookie_name, self.serializer.dumps(dict(self.data)),
+            domain=interface.get_cookie_domain(app), path=interface.get_cookie_path(app),
+            secure=interface.get_cookie_secure(app), httponly=interface.get_cookie_httponly(app),
+            samesite=interface.get_cookie_samesite(app)
+        )
+        return [(b'vary', b'Cookie'), (b'set-cookie', value.encode('latin-1'))]
+
+async def application(scope, receive, send):
+    """ASGI entry point"""
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    headers = {name.lower(): value for name, value in scope['headers']}
+    path, method = scope['path'], scope['method']
+    if path in ('/', '/examples'):
+        if method not in ('GET', 'HEAD'):
+            await send_response(send, 405, [(b'allow', b'GET, HEAD')], b'Method Not Allowed')
+            return
+        await send_static(send, index_response if path == '/' else examples_response, headers, method)
+    elif path in ('/execute', '/state-at', '/reset'):
+        if method != 'POST':
+            await send_response(send, 405, [(b'allow', b'POST')], b'Method Not Allowed')
+            return
+        body = await read_body(receive)
+        if body is None:
+            return
+        session = Session(headers)
+        if path == '/execute':
+            status, extra, payload = await execute(session, headers, body)
+        elif path == '/state-at':
+            status, extra, payload = await state_at(session, headers, body)
+        else:
+            status, extra, payload = await reset(session)
+        await send_response(send, status, [(b'content-type', b'application/json')] + extra + session.headers(), payload)
+    else:
+        await send_response(send, 404, [], b'Not Found')
+
+async def execute(session: Session, headers: Dict[bytes, bytes], body: bytes) -> Tuple[int, Headers, bytes]:
+    """POST /execute; mirrors app.execute_code"""
+    try:
+        data = load_json(headers, body)
+        code = data.get('code', '').strip()
+
+        if not code:
+            return 200, [], dumps({'error': 'No code provided'})
+
+        session_id = session.id
+        async with session_lock(session_id):
+            try:
+                return await run_in_executor(run_serialized, session_id, code)
+            except Overloaded as e:
+                return turn_away(session_id, e)
+
+    except Exception as e:
+        return 200, [], dumps({
+            'success': False,
+            'error': f"Server error: {str(e)}"
+        })
+
+async def state_at(session: Session, headers: Dict[bytes, bytes], body: bytes) -> Tuple[int, Headers, bytes]:
+    """POST /state-at; mirrors app.state_at"""
+    try:
+        data = load_json(headers, body)
+        # Session first, as app.state_at evaluates its arguments
+        session_id = session.id
+        code, line = data.get('code', ''), int(data.get('line', 0))
+        async with session_lock(session_id):
+            try:
+                return 200, [], dumps(await run_in_executor(session_state_at, session_id, code, line))
+            except Overloaded as e:
+                return turn_away(session_id, e)
+    except Exception as e:
+        return 200, [], dumps({
+            'success': False,
+            'error': f"Error: {str(e)}"
+        })
+
+async def run_in_executor(function, *args):
+    """
+    Run function on the executor, counting it in in_flight until it finishes.
+    Raises Overloaded, without running it, when the pool's backlog is full.
+    """
+    global in_flight
+    with in_flight_lock:
+        if in_flight >= MAX_IN_FLIGHT:
+            raise scheduler.reject()
+        in_flight += 1
+    try:
+        future = asyncio.get_running_loop().run_in_executor(executor, run_counted, function, args)
+    except BaseException:
+        with in_flight_lock:
+            in_flight -= 1
+        raise
+    return await future
+
+def run_counted(function, args):
+    """
+    Run a job on an executor thread. It leaves in_flight as soon as it is
+    done, not when a busy event loop gets round to resuming its request.
+    """
+    global in_flight
+    try:
+        return function(*args)
+    finally:
+        with in_flight_lock:
+            in_flight -= 1
+
+def run_serialized(session_id: str, code: str) -> Tuple[int, Headers, bytes]:
+    """Run a program and serialize the result, on an executor thread"""
+    payload, status, extra = run_program(session_id, code)
+    with metrics.time('serialize'):
+        body = dumps(payload)
+    return status, encode_headers(extra), body
+
+def turn_away(session_id: str, error: Overloaded) -> Tuple[int, Headers, bytes]:
+    """The 429 answer run_program gives when admission control refuses a run"""
+    payload, status, extra = overloaded(session_id, error)
+    return status, encode_headers(extra), dumps(payload)
+
+def encode_headers(headers: Dict[str, str]) -> Headers:
+    return [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+
+async def reset(session: Session) -> Tuple[int, Headers, bytes]:
+    """POST /reset; mirrors app.reset_interpreter"""
+    session_id = session.id
+    async with session_lock(session_id):
+        return 200, [], dumps(reset_session(session_id))
+
+@asynccontextmanager
+async def session_lock(session_id: str):
+    """Hold the session's lock; the lock is forgotten once no request needs it"""
+    entry = session_locks.get(session_id)
+    if entry is None:
+        entry = session_locks[session_id] = SessionLock()
+    entry.users += 1
+    try:
+        async with entry.lock:
+            yield
+    finally:
+        entry.users -= 1
+        if not entry.users:
+            del session_locks[session_id]
+
+def load_json(headers: Dict[bytes, bytes], body: bytes):
+    """The request body as JSON, failing the way Flask's request.get_json does"""
+    mimetype = headers.get(b'content-type', b'').decode('latin-1').split(';', 1)[0].strip().lower()
+    if not (mimetype == 'application/json' or (mimetype.startswith('application/') and mimetype.endswith('+json'))):
+        raise UnsupportedMediaType(
+            "Did not attempt to load JSON data because the request Content-Type was not 'application/json'."
+        )
+    try:
+        return app.json.loads(body)
+    except ValueError:
+        raise BadRequest()
+
+def dumps(payload) -> bytes:
+    """JSON body exactly as Flask's jsonify writes it"""
+    return app.json.response(payload).get_data()
+
+async def send_static(send, response, headers: Dict[bytes, bytes], method: str):
+    with app.app_context():
+        status, extra, body = response.serve_raw(
+            headers.get(b'accept-encoding', b'').decode('latin-1'),
+            headers.get(b'if-none-match', b'').decode('latin-1'),
+        )
+    await send_response(send, status, [(name.lower().encode(), value.encode()) for name, value in extra],
+                        b'' if method == 'HEAD' else body, len(body))
+
+async def send_response(send, status: int, headers: Headers, body: bytes, length: int = None):
+    length = len(body) if length is None else length
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': headers + [(b'content-length', str(length).encode())],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+async def read_body(receive) -> Optional[bytes]:
+    """The whole request body, or None if the client went away first"""
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+async def lifespan(receive, send):
+    """Warm the app up off the event loop at startup; stop the pool at shutdown"""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await asyncio.get_running_loop().run_in_executor(executor, warm_up)
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            executor.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
@@ -0,0 +1,102 @@
+"""
+Cold-start measurements for the web app as deployed on Vercel.
+
+Checks `import app` against an import-time budget (with the slowest modules
+from `python -X importtime`), and times fresh processes from launch to the
+first response on /, /examples and /execute, the way a cold serverless
+instance would serve them.
+
+    python benchmarks/coldstart.py                  # report, fail over budget
+    python benchmarks/coldstart.py --budget 0.5 --output coldstart.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds `import app` may take before the check fails
+IMPORT_BUDGET = 0.35
+
+# Runs in the fresh process: import the app and serve one request through WSGI
+FIRST_REQUEST = """
+import sys
+from app import app
+client = app.test_client()
+method, path = sys.argv[1], sys.argv[2]
+if method == 'POST':
+    response = client.post(path, json={'code': 'I am GROOT!\\nI am GROOT'})
+else:
+    response = client.get(path, headers={'Accept-Encoding': 'gzip'})
+print(response.status_code, flush=True)
+"""
+
+REQUESTS = (('GET', '/'), ('GET', '/examples'), ('POST', '/execute'))
+
+def import_profile() -> dict:
+    """Total `import app` time and the modules that cost the most (seconds)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        modules[name.strip()] = (int(self_us) / 1e6, int(cumulative_us) / 1e6)
+    slowest = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:10]
+    return {
+        'import': modules['app'][1],
+        'slowest': [{'module': name, 'self': own, 'cumulative': total} for name, (own, total) in slowest],
+    }
+
+def first_response(method: str, path: str) -> float:
+    """Seconds from launching a fresh process to its first response"""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-c', FIRST_REQUEST, method, path],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True
+    )
+    status = process.stdout.readline().strip()
+    elapsed = time.perf_counter() - start
+    process.stdout.close()
+    process.wait()
+    if status not in ('200', '204'):
+        raise RuntimeError(f"{method} {path} answered {status or 'nothing'}")
+    return elapsed
+
+def measure(repeat: int) -> dict:
+    """Best-of-repeat cold start for each request, plus the import profile"""
+    results = import_profile()
+    for method, path in REQUESTS:
+        results[f'{method} {path}'] = min(first_response(method, path) for _ in range(repeat))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start measurements for app.py")
+    parser.add_argument('--budget', type=float, default=IMPORT_BUDGET, help="import-time budget in seconds")
+    parser.add_argument('--repeat', type=int, default=5, help="fresh processes per request (best is kept)")
+    parser.add_argument('--output', help="write results JSON here")
+    args = parser.parse_args()
+
+    results = measure(args.repeat)
+    print(f"import app        {results['import'] * 1000:8.1f}ms  (budget {args.budget * 1000:.0f}ms)")
+    for entry in results['slowest']:
+        print(f"  {entry['module']:<24} self {entry['self'] * 1000:7.1f}ms  "
+              f"cumulative {entry['cumulative'] * 1000:7.1f}ms")
+    for method, path in REQUESTS:
+        print(f"first {method} {path:<10} {results[f'{method} {path}'] * 1000:8.1f}ms")
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    if results['import'] > args.budget:
+        print(f"OVER BUDGET: import app took {results['import'] * 1000:.1f}ms")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
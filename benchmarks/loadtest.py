@@ -0,0 +1,227 @@
+"""
+Load-testing harness for the Flask app in app.py.
+
+Drives /execute and /reset from many concurrent sessions, either in-process
+through Flask's test client or against a locally started server, and reports
+p50/p95/p99 latency (small and large programs separately), requests/sec,
+requests turned away with 429 and the server's RSS.
+
+    python benchmarks/loadtest.py                               # examples scenario, test client
+    python benchmarks/loadtest.py --scenario large --server     # real HTTP server
+    python benchmarks/loadtest.py --sessions 200 --concurrency 32 --requests 5000
+"""
+
+import argparse
+import glob
+import http.cookiejar
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from suite import increments, function_calls, print_heavy
+
+def bundled_programs() -> list:
+    """The app's /examples programs plus the files in examples/"""
+    from app import app
+    programs = list(app.test_client().get('/examples').get_json().values())
+    for path in sorted(glob.glob(os.path.join(ROOT, 'examples', '*.groot'))):
+        with open(path) as file:
+            programs.append(file.read())
+    return programs
+
+def large_programs() -> list:
+    """Programs the size of a big paste into the editor"""
+    return [increments(20_000), function_calls(5_000), print_heavy(20_000)]
+
+def scenario(name: str) -> list:
+    """Weighted request mix: (weight, label, path, payload)"""
+    mix = []
+    if name in ('examples', 'mixed'):
+        mix += [(10, '/execute', '/execute', {'code': code}) for code in bundled_programs()]
+    if name in ('large', 'mixed'):
+        mix += [(2, '/execute large', '/execute', {'code': code}) for code in large_programs()]
+    mix.append((1, '/reset', '/reset', None))
+    return mix
+
+SCENARIOS = ('examples', 'large', 'mixed')
+
+class TestClientSession:
+    """One editor session driven through Flask's in-process test client"""
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def post(self, path: str, payload) -> int:
+        return self.client.post(path, json=payload).status_code
+
+class HttpSession:
+    """One editor session talking to a real server, with its own cookies"""
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+
+    def post(self, path: str, payload) -> int:
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(payload or {}).encode(),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        try:
+            with self.opener.open(request) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            # 429 and friends still carry a status worth reporting
+            return e.code
+
+def rss_kb(pid: int) -> dict:
+    """Current and peak resident set size of a process, in kB"""
+    usage = {}
+    try:
+        with open(f'/proc/{pid}/status') as file:
+            for line in file:
+                if line.startswith(('VmRSS:', 'VmHWM:')):
+                    key, value = line.split(':')
+                    usage['rss' if key == 'VmRSS' else 'peak_rss'] = int(value.split()[0])
+    except OSError:
+        import resource
+        # ru_maxrss is only available for this process (kB on Linux, bytes on macOS)
+        usage['peak_rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(port: int) -> subprocess.Popen:
+    """Start app.py on a threaded development server and wait until it answers"""
+    server = subprocess.Popen(
+        [sys.executable, '-c', f"from app import app; app.run(port={port}, threaded=True)"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/examples').read()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("server did not start")
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+def run_load(sessions: list, mix: list, total: int, concurrency: int, seed: int) -> dict:
+    """Send `total` requests; each worker owns a disjoint group of sessions"""
+    weights = [weight for weight, _, _, _ in mix]
+    latencies = {}
+    failures = 0
+    rejected = 0
+
+    def worker(index: int):
+        rng = random.Random(seed + index)
+        owned = sessions[index::concurrency]
+        timings = []
+        failed = 0
+        throttled = 0
+        for count in range(index, total, concurrency):
+            _, label, path, payload = rng.choices(mix, weights)[0]
+            session = owned[count % len(owned)]
+            start = time.perf_counter()
+            try:
+                status = session.post(path, payload)
+            except OSError:
+                status = None
+            timings.append((label, time.perf_counter() - start))
+            if status == 429:
+                throttled += 1
+            elif status != 200:
+                failed += 1
+        return timings, failed, throttled
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        for timings, failed, throttled in pool.map(worker, range(concurrency)):
+            failures += failed
+            rejected += throttled
+            for label, seconds in timings:
+                latencies.setdefault(label, []).append(seconds)
+    elapsed = time.perf_counter() - start
+
+    report = {'requests': total, 'failures': failures, 'rejected': rejected, 'seconds': elapsed,
+              'requests_per_sec': total / elapsed if elapsed else 0.0, 'endpoints': {}}
+    everything = sorted(s for values in latencies.values() for s in values)
+    for path, values in [('all', everything)] + sorted(latencies.items()):
+        values = sorted(values)
+        report['endpoints'][path] = {
+            'count': len(values),
+            'p50_ms': percentile(values, 0.50) * 1000,
+            'p95_ms': percentile(values, 0.95) * 1000,
+            'p99_ms': percentile(values, 0.99) * 1000,
+        }
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the Groot web app")
+    parser.add_argument('--scenario', choices=SCENARIOS, default='examples')
+    parser.add_argument('--sessions', type=int, default=50, help="distinct editor sessions")
+    parser.add_argument('--concurrency', type=int, default=8, help="requests in flight")
+    parser.add_argument('--requests', type=int, default=1000, help="total requests")
+    parser.add_argument('--server', action='store_true', help="use a local HTTP server instead of the test client")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write the report JSON here")
+    args = parser.parse_args()
+
+    mix = scenario(args.scenario)
+    session_count = max(args.sessions, args.concurrency)
+    server = None
+    if args.server:
+        port = free_port()
+        server = start_server(port)
+        sessions = [HttpSession(f'http://127.0.0.1:{port}') for _ in range(session_count)]
+        server_pid = server.pid
+    else:
+        from app import app
+        sessions = [TestClientSession(app) for _ in range(session_count)]
+        server_pid = os.getpid()
+
+    try:
+        report = run_load(sessions, mix, args.requests, args.concurrency, args.seed)
+        report.update(scenario=args.scenario, sessions=session_count,
+                      concurrency=args.concurrency, mode='server' if server else 'test-client')
+        report['memory_kb'] = rss_kb(server_pid)
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    print(f"{report['scenario']} ({report['mode']}): {report['requests']} requests, "
+          f"{report['failures']} failed, {report['rejected']} rejected (429), "
+          f"{report['requests_per_sec']:.1f} req/s")
+    for path, stats in report['endpoints'].items():
+        print(f"  {path:<14} n={stats['count']:<6} p50 {stats['p50_ms']:8.2f}ms  "
+              f"p95 {stats['p95_ms']:8.2f}ms  p99 {stats['p99_ms']:8.2f}ms")
+    print(f"  {'memory':<14} {report['memory_kb']}")
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+if __name__ == '__main__':
+    main()
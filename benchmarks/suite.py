@@ -0,0 +1,202 @@
+"""
+Benchmark suite for the Groot front end and interpreter.
+
+Generates synthetic workloads, times GrootParser.tokenize, GrootParser.parse
+and GrootInterpreter.interpret separately plus an end-to-end main.py run and
+main.py's startup-to-first-output time and the web app's cold start to first
+response, writes the results as JSON and fails when a phase regresses past
+the stored baseline.
+
+    python benchmarks/suite.py                     # compare with baseline.json
+    python benchmarks/suite.py --scale 0.1         # smaller workloads
+    python benchmarks/suite.py --update-baseline   # record a new baseline
+"""
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from parser import GrootParser
+from interpreter import GrootInterpreter
+from coldstart import first_response
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+def increments(size: int) -> str:
+    """Straight-line increments, one per line"""
+    return '\n'.join(['I am GROOT!'] * size + ['I am GROOT'])
+
+def nested_try_catch(size: int, depth: int = 20) -> str:
+    """Blocks of try/catch nested `depth` levels deep, failing at the bottom"""
+    block = []
+    for level in range(depth):
+        block.append('    ' * level + 'I am Groot???')
+    block.append('    ' * depth + 'I am groot?')
+    # Catch markers sit at the indentation of the body they belong to
+    for level in reversed(range(depth)):
+        block.append('    ' * (level + 1) + 'I am Groot!!!')
+        block.append('    ' * (level + 1) + 'I am groot!')
+        block.append('    ' * (level + 1) + 'I am Groot!!!.')
+    return '\n'.join(block * max(size // len(block), 1))
+
+def function_calls(size: int) -> str:
+    """A small function called over and over"""
+    lines = [
+        'I am... Groot,',
+        '    I am GROOT!',
+        '    I am groot! I am GROOT',
+        '    I am groot.',
+    ]
+    calls = ['I am... Groot', 'I am groot, I am... Groot', 'I am GROOT, I am... Groot']
+    lines += [calls[i % len(calls)] for i in range(size)]
+    return '\n'.join(lines)
+
+def doubling_chain(size: int) -> str:
+    """GROOT doubles every line, so values grow to `size` bits"""
+    return '\n'.join(['I am GROOT!'] + ['I am GROOT! I am GROOT'] * size)
+
+def print_heavy(size: int) -> str:
+    """Alternating updates and prints"""
+    pattern = ['I am GROOT!', 'I am GROOT', 'I am groot! I am GROOT', 'I am groot']
+    return '\n'.join(pattern[i % len(pattern)] for i in range(size))
+
+# Workload name -> (generator, size at scale 1.0)
+WORKLOADS = {
+    'increments': (increments, 1_000_000),
+    'nested_try_catch': (nested_try_catch, 200_000),
+    'function_calls': (function_calls, 200_000),
+    'doubling_chain': (doubling_chain, 20_000),
+    'print_heavy': (print_heavy, 500_000),
+}
+
+def best_of(repeat: int, func, *args):
+    """Fastest of `repeat` timed calls, with the last result"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def run_interpreter(ast):
+    """Interpret on a fresh interpreter with output discarded"""
+    with redirect_stdout(io.StringIO()):
+        GrootInterpreter().interpret(ast)
+
+def run_main(path: str):
+    """End-to-end headless run of a file through main.py"""
+    subprocess.run(
+        [sys.executable, os.path.join(ROOT, 'main.py'), path],
+        cwd=ROOT, stdout=subprocess.DEVNULL
+    )
+
+def first_output(path: str):
+    """Launch main.py on a file and wait for its first line of output"""
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, 'main.py'), path],
+        cwd=ROOT, stdout=subprocess.PIPE
+    )
+    process.stdout.readline()
+    process.stdout.close()
+    process.wait()
+
+def run_suite(scale: float, repeat: int, workdir: str) -> dict:
+    """Time every phase of every workload"""
+    results = {}
+    for name, (generator, size) in WORKLOADS.items():
+        code = generator(max(int(size * scale), 1))
+        path = os.path.join(workdir, f'{name}.groot')
+        with open(path, 'w') as file:
+            file.write(code)
+
+        tokenize, tokens = best_of(repeat, lambda: GrootParser().tokenize(code))
+        parse, ast = best_of(repeat, lambda: GrootParser().parse(tokens))
+        interpret, _ = best_of(repeat, run_interpreter, ast)
+        end_to_end, _ = best_of(repeat, run_main, path)
+        results[name] = {
+            'lines': code.count('\n') + 1,
+            'tokenize': tokenize,
+            'parse': parse,
+            'interpret': interpret,
+            'end_to_end': end_to_end,
+        }
+        print(f"{name:<18} tokenize {tokenize:8.3f}s  parse {parse:8.3f}s  "
+              f"interpret {interpret:8.3f}s  main.py {end_to_end:8.3f}s")
+
+    # Process start to the first executed statement's output
+    path = os.path.join(workdir, 'startup.groot')
+    with open(path, 'w') as file:
+        file.write('I am GROOT')
+    startup, _ = best_of(max(repeat, 5), first_output, path)
+    results['startup'] = {'first_output': startup}
+    print(f"{'startup':<18} first output {startup:8.3f}s")
+
+    # Fresh app process to its first /execute response, as on a cold serverless instance
+    cold_start, _ = best_of(max(repeat, 5), first_response, 'POST', '/execute')
+    results['cold_start'] = {'first_response': cold_start}
+    print(f"{'cold_start':<18} first response {cold_start:8.3f}s")
+    return results
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Phases slower than baseline * (1 + threshold)"""
+    regressions = []
+    for name, phases in results.items():
+        for phase, seconds in phases.items():
+            if phase == 'lines':
+                continue
+            reference = baseline.get(name, {}).get(phase)
+            if reference and seconds > reference * (1 + threshold):
+                regressions.append(f"{name}.{phase}: {seconds:.3f}s vs baseline {reference:.3f}s")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Groot benchmark suite")
+    parser.add_argument('--scale', type=float, default=1.0, help="workload size multiplier")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per phase (best is kept)")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument('--output', help="write results JSON here")
+    parser.add_argument('--baseline', default=BASELINE, help="baseline JSON to compare against")
+    parser.add_argument('--update-baseline', action='store_true', help="store these results as the baseline")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = run_suite(args.scale, args.repeat, workdir)
+    report = {'scale': args.scale, 'python': sys.version.split()[0], 'results': results}
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(report, file, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline first")
+        return
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    if baseline.get('scale') != args.scale:
+        print(f"Baseline was recorded at scale {baseline.get('scale')}; not comparing")
+        return
+    regressions = compare(results, baseline['results'], args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+    print("No regressions")
+
+if __name__ == '__main__':
+    main()
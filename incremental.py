@@ -0,0 +1,262 @@
+from typing import List, Dict, Any
+from parser import Token, GrootParser
+
+# Lines compared at once when diffing buffers; doubled while they match
+DIFF_WINDOW = 64
+
+class _Positions:
+    """
+    Sorted token positions that shift together when tokens are inserted or
+    removed before them. The shift is applied lazily: values from index gap
+    on are really shift larger, and the gap only moves to where the next
+    splice happens, so a splice costs its own size plus its distance from
+    the previous one rather than the length of the list.
+    """
+    def __init__(self):
+        self.values: List[int] = []
+        self.gap = 0
+        self.shift = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> int:
+        value = self.values[index]
+        return value + self.shift if index >= self.gap else value
+
+    def find(self, position: int) -> int:
+        """Index of the first value >= position"""
+        lo, hi = 0, len(self.values)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self[mid] < position:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def splice(self, start: int, end: int, values: List[int], delta: int):
+        """Replace values [start, end) and shift everything after them by delta"""
+        self._move_gap(end)
+        self.values[start:end] = values
+        self.gap = start + len(values)
+        self.shift += delta
+
+    def _move_gap(self, index: int):
+        values, shift = self.values, self.shift
+        for i in range(self.gap, index):
+            values[i] += shift
+        for i in range(index, self.gap):
+            values[i] -= shift
+        self.gap = index
+
+class IncrementalParser(GrootParser):
+    """
+    GrootParser that remembers the previous program between runs.
+    Each new buffer is diffed against the last one: only the edited lines are
+    re-tokenized and only the top-level blocks they touch are re-parsed.
+    The AST's statement list and function table are patched in place, and
+    the line numbers of tokens after an edit are shifted lazily, so an edit
+    costs about the same however long the program is.
+    """
+    def __init__(self):
+        super().__init__()
+        self.lines: List[str] = []
+        # Token index where each statement of ast['statements'] starts
+        self.starts = _Positions()
+        # Token index and node of each top-level function declaration
+        self.declaration_starts = _Positions()
+        self.declarations: List[Dict[str, Any]] = []
+        # Tokens from index line_gap on are really line_shift lines further down
+        self.line_gap = 0
+        self.line_shift = 0
+        self.ast = {
+            'type': 'PROGRAM',
+            'statements': [],
+            'functions': {}
+        }
+
+    def tokenize(self, code: str) -> List[Token]:
+        """
+        Diff code against the previous buffer and apply the change as an edit.
+        Returns the full, up-to-date token list; read token lines through
+        token_line, since Token.line lags behind until the shift reaches it.
+        """
+        old_lines = self.lines
+        new_lines = code.split('\n')
+        limit = min(len(old_lines), len(new_lines))
+        # Skip the unchanged head and tail of the buffer
+        prefix = _common_length(old_lines, new_lines, limit, lambda lo, hi: (lo, hi))
+        suffix = _common_length(old_lines, new_lines, limit - prefix,
+                                lambda lo, hi: (-hi, -lo or None))
+        return self.edit(prefix, len(old_lines) - suffix, new_lines[prefix:len(new_lines) - suffix])
+
+    def edit(self, start: int, end: int, new_lines: List[str]) -> List[Token]:
+        """
+        Replace source lines [start, end) (0-based) with new_lines.
+        Re-tokenizes only new_lines and re-parses the enclosing top-level blocks.
+        """
+        # Tokens are ordered by their (1-based) line number
+        first = self._find_token(start + 1)
+        last = self._find_token(end + 1)
+        fresh = self._tokenize_lines(new_lines, start + 1)
+
+        # Tokens after the edit move up or down; renumbered lazily
+        self._move_line_gap(last)
+        self.lines[start:end] = new_lines
+        self.tokens[first:last] = fresh
+        self.line_gap = first + len(fresh)
+        self.line_shift += len(new_lines) - (end - start)
+
+        # Blank or comment-only edits leave the token stream untouched
+        if fresh or first != last:
+            self._reparse(first, last, len(fresh))
+        return self.tokens
+
+    def parse(self, tokens: List[Token]) -> Dict[str, Any]:
+        """
+        Return the incrementally maintained AST for our own token list.
+        Any other token list is parsed from scratch.
+        """
+        if tokens is self.tokens:
+            return self.ast
+        return GrootParser().parse(tokens)
+
+    def token_line(self, index: int) -> int:
+        """Source line of the token at index"""
+        line = self.tokens[index].line
+        return line + self.line_shift if index >= self.line_gap else line
+
+    def statement_lines(self) -> List[int]:
+        """Source line each statement of ast['statements'] starts on"""
+        return [self.token_line(self.starts[i]) for i in range(len(self.starts))]
+
+    def _find_token(self, line: int) -> int:
+        """Index of the first token on or after line"""
+        lo, hi = 0, len(self.tokens)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.token_line(mid) < line:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _move_line_gap(self, index: int):
+        tokens, shift = self.tokens, self.line_shift
+        for i in range(self.line_gap, index):
+            tokens[i].line += shift
+        for i in range(index, self.line_gap):
+            tokens[i].line -= shift
+        self.line_gap = index
+
+    def _tokenize_lines(self, lines: List[str], first_line: int) -> List[Token]:
+        """Tokenize a run of source lines without touching the program tokens"""
+        program_tokens, self.tokens = self.tokens, []
+        self.line_number = first_line - 1
+        for line in lines:
+            self.line_number += 1
+            self._tokenize_source_line(line)
+        fresh, self.tokens = self.tokens, program_tokens
+        return fresh
+
+    def _is_boundary(self, position: int) -> bool:
+        """Whether a top-level statement or declaration started at old token position"""
+        i = self.starts.find(position)
+        if i < len(self.starts) and self.starts[i] == position:
+            return True
+        i = self.declaration_starts.find(position)
+        return i < len(self.declaration_starts) and self.declaration_starts[i] == position
+
+    def _reparse(self, first: int, last: int, count: int):
+        """
+        Re-parse after tokens [first, last) were replaced by count new tokens.
+        Parsing restarts at the top-level statement that reached the edit and
+        stops as soon as it lands back on an old statement boundary past it.
+        """
+        delta = count - (last - first)
+        # Restart at the last statement starting before the edit, since a
+        # block also peeks at the token right after it
+        restart = 0
+        i = self.starts.find(first) - 1
+        if i >= 0:
+            restart = self.starts[i]
+        i = self.declaration_starts.find(first) - 1
+        if i >= 0:
+            restart = max(restart, self.declaration_starts[i])
+        self.current_token = restart
+
+        starts, statements = [], []
+        declaration_starts, declarations = [], []
+        # Old position of the first statement parsing rejoined, None at the end
+        resume = None
+        while self.current_token < len(self.tokens):
+            if self.current_token >= first + count:
+                # Past the edit: everything from an old boundary on parses the same
+                if self._is_boundary(self.current_token - delta):
+                    resume = self.current_token - delta
+                    break
+            start = self.current_token
+            stmt = self._parse_statement()
+            if stmt:
+                if stmt['type'] == 'FUNCTION_DECL':
+                    declaration_starts.append(start)
+                    declarations.append(stmt)
+                else:
+                    starts.append(start)
+                    statements.append(stmt)
+
+        # Splice the re-parsed range into the statement list
+        a = self.starts.find(restart)
+        b = self.starts.find(resume) if resume is not None else len(self.starts)
+        self.starts.splice(a, b, starts, delta)
+        self.ast['statements'][a:b] = statements
+
+        # And into the declarations, updating the function table for the
+        # names that were declared or dropped
+        a = self.declaration_starts.find(restart)
+        b = self.declaration_starts.find(resume) if resume is not None else len(self.declaration_starts)
+        names = {decl['name'] for decl in self.declarations[a:b]}
+        names.update(decl['name'] for decl in declarations)
+        self.declaration_starts.splice(a, b, declaration_starts, delta)
+        self.declarations[a:b] = declarations
+        functions = self.ast['functions']
+        if names:
+            functions = dict(functions)
+            for name in names:
+                functions.pop(name, None)
+            # Declaring a name again replaces the earlier definition
+            for decl in reversed(self.declarations):
+                if decl['name'] in names and decl['name'] not in functions:
+                    functions[decl['name']] = decl
+
+        # A new PROGRAM node, so caches keyed on the AST see the change
+        self.ast = {
+            'type': 'PROGRAM',
+            'statements': self.ast['statements'],
+            'functions': functions
+        }
+
+def _common_length(old: list, new: list, limit: int, window) -> int:
+    """
+    How many lines match, up to limit, between old and new, compared a
+    window at a time in C; window(lo, hi) gives the slice bounds of the
+    lo-th to hi-th lines from whichever end is being matched.
+    """
+    lo, width = 0, DIFF_WINDOW
+    while lo < limit:
+        hi = min(lo + width, limit)
+        begin, end = window(lo, hi)
+        if old[begin:end] != new[begin:end]:
+            # The first difference is in [lo, hi): narrow it down
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                begin, end = window(lo, mid)
+                if old[begin:end] == new[begin:end]:
+                    lo = mid
+                else:
+                    hi = mid
+            return lo
+        lo = hi
+        width *= 2
+    return limit
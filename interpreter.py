@@ -1,68 +1,164 @@
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Iterable, Optional, TYPE_CHECKING
+from analysis import RangeAnalysis
+import registers
+
+if TYPE_CHECKING:
+    # Only for annotations; runs without tracing never load the recorder
+    from recorder import TraceRecorder
 
 # Custom exception for all Groot language errors
 class GrootError(Exception):
     pass
 
+# Error message -> kind reported in metrics; anything else counts as 'other'
+ERROR_KINDS = {
+    'negative value prevented': 'negative_value',
+    'function undefined': 'function_undefined',
+}
+
+def error_kind(message: str) -> str:
+    """Classify an error message for metrics"""
+    if message.startswith('Runtime error'):
+        return 'runtime'
+    return ERROR_KINDS.get(message, 'other')
+
 class GrootInterpreter:
-    def __init__(self):
-        # Initialize interpreter state: two variables, optional function, error state
+    def __init__(self, optimize: bool = True, trace: Optional['TraceRecorder'] = None,
+                 fixed_width: bool = False, output: Callable[[str], None] = print):
+        # Initialize interpreter state: two variables, declared functions, error state
         self.variables = {
             'GROOT': 0,
             'groot': 0
         }
-        self.function = None
+        # Function name (its number of dots) -> FUNCTION_DECL node
+        self.functions = {}
         self.in_try_catch = False
         self.current_error = None
+        # Range analysis drops checks that provably cannot fail. On a first run
+        # it costs more than it saves, so it only starts when the same
+        # (ast, functions) pair runs again, and the result is cached from then on
+        self.optimize = optimize
+        self._optimized = None
+        # Optional execution-trace recorder (see recorder.py)
+        self.trace = trace
+        # Run top-level statements on 64-bit registers until a value outgrows
+        # them (see registers.py); the decoded program is cached like _optimized
+        self.fixed_width = fixed_width
+        self._encoded = None
+        # Called with each line the program prints; the web app points it at
+        # the current request's output
+        self.output = output
+        # Running totals for metrics; not cleared by reset()
+        self.statements_executed = 0
+        self.error_counts = {}
+        # Errors that were reported rather than caught by a try/catch block
+        self.errors_reported = 0
         
     def interpret(self, ast: Dict[str, Any]) -> None:
         """Interpret the AST and execute the program"""
-        try:
-            # First, collect function definition if present
-            if ast.get('function'):
-                self.function = ast['function']
+        self.interpret_stream([ast])
 
-            # Then, execute all top-level statements
-            for statement in ast['statements']:
-                self._execute_statement(statement)
+    def interpret_stream(self, programs: Iterable[Dict[str, Any]]) -> None:
+        """
+        Interpret a program that arrives in consecutive pieces, such as those
+        from GrootParser.parse_stream, running each piece as soon as it is
+        taken. The pieces run as one program: an error that escapes a piece
+        ends the run, and the remaining pieces are not taken.
+        """
+        for ast in programs:
+            try:
+                # First, collect function definitions; earlier ones stay callable
+                self.functions.update(ast.get('functions', {}))
 
-        except GrootError as e:
-            self._handle_error(str(e))
-        except Exception as e:
-            # Catch-all for unexpected runtime errors
-            self._handle_error(f"Runtime error: {str(e)}")
+                # Then, execute all top-level statements
+                statements = self._top_level_statements(ast)
+                if self.fixed_width and self.trace is None and not self.in_try_catch:
+                    registers.run(self, self._encoded_statements(ast, statements))
+                else:
+                    if self.trace is not None:
+                        self.trace.locate(statements)
+                    for statement in statements:
+                        self._execute_statement(statement)
+
+            except GrootError as e:
+                self._handle_error(str(e))
+                return
+            except Exception as e:
+                # Catch-all for unexpected runtime errors
+                self._handle_error(f"Runtime error: {str(e)}")
+                return
+
+    def _top_level_statements(self, ast: Dict[str, Any]):
+        """Top-level statements to run, rewritten by range analysis from the second run on"""
+        # Lowered try/catch blocks rely on starting outside any try block, and
+        # a trace shows the program as written, one top-level statement each
+        if not self.optimize or self.in_try_catch or self.trace is not None:
+            return ast['statements']
+        cached = self._optimized
+        # Equal function tables inline and analyze identically
+        if cached is None or cached[0] is not ast or cached[1] != self.functions:
+            # First run of this program: remember it, run it as it is
+            self._optimized = (ast, dict(self.functions), None)
+            return ast['statements']
+        if cached[2] is None:
+            statements = RangeAnalysis(self.functions).optimize(ast['statements'])
+            cached = self._optimized = (ast, cached[1], statements)
+        return cached[2]
+
+    def _encoded_statements(self, ast: Dict[str, Any], statements):
+        """Top-level statements decoded for the register file"""
+        # Keyed on the AST too: an incremental parser edits its statement list in place
+        cached = self._encoded
+        if cached is None or cached[0] is not ast or cached[1] is not statements:
+            cached = self._encoded = (ast, statements, registers.encode(statements))
+        return cached[2]
 
     def _execute_statement(self, stmt: Dict[str, Any]) -> Optional[int]:
         """Execute a single statement from the AST."""
+        result = None
+        self.statements_executed += 1
         try:
             stype = stmt['type']
             if stype == 'INCREMENT':
-                return self._increment_variable(stmt['variable'])
+                result = self._increment_variable(stmt['variable'])
             elif stype == 'DECREMENT':
-                return self._decrement_variable(stmt['variable'])
+                result = self._decrement_variable(stmt['variable'])
+            elif stype == 'DECREMENT_UNCHECKED':
+                self.variables[stmt['variable']] -= 1
+                result = self.variables[stmt['variable']]
             elif stype == 'PRINT':
-                return self._print_variable(stmt['variable'])
+                result = self._print_variable(stmt['variable'])
             elif stype == 'ASSIGN':
-                return self._assign_variable(stmt['left'], stmt['right'])
+                result = self._assign_variable(stmt['left'], stmt['right'])
             elif stype == 'FUNC_ASSIGN':
-                return self._function_assign(stmt['variable'])
+                result = self._function_assign(stmt['variable'], stmt['function'])
             elif stype == 'ADD':
-                return self._add_variables(stmt['left'], stmt['right'])
+                result = self._add_variables(stmt['left'], stmt['right'])
             elif stype == 'SUBTRACT':
-                return self._subtract_variables(stmt['left'], stmt['right'])
+                result = self._subtract_variables(stmt['left'], stmt['right'])
+            elif stype == 'SUBTRACT_UNCHECKED':
+                self.variables[stmt['left']] -= self.variables[stmt['right']]
+                result = self.variables[stmt['left']]
             elif stype == 'FUNCTION_CALL':
-                return self._call_function()
+                result = self._call_function(stmt['function'])
             elif stype == 'TRY_CATCH':
-                return self._execute_try_catch(stmt)
+                result = self._execute_try_catch(stmt)
             elif stype == 'RETURN':
-                return self.variables[stmt['variable']]
+                result = self.variables[stmt['variable']]
+            elif stype == 'SUCCESS_OUTPUT':
+                result = self._print_success_output()
         except GrootError as e:
+            if self.trace is not None:
+                self.trace.record(stmt, self.variables, error=True)
             # If not in try-catch, handle error; otherwise, propagate
             if not self.in_try_catch:
                 self._handle_error(str(e))
+                return None
             else:
                 raise e
-        return None
+        if self.trace is not None:
+            self.trace.record(stmt, self.variables)
+        return result
 
     def _increment_variable(self, var_name: str) -> int:
         """Increment a variable by 1"""
@@ -79,7 +175,7 @@ class GrootInterpreter:
     def _print_variable(self, var_name: str) -> int:
         """Print the value of a variable"""
         value = self.variables[var_name]
-        print(value)
+        self.output(str(value))
         return value
 
     def _assign_variable(self, left_var: str, right_var: str) -> int:
@@ -87,11 +183,9 @@ class GrootInterpreter:
         self.variables[left_var] = self.variables[right_var]
         return self.variables[left_var]
 
-    def _function_assign(self, var_name: str) -> int:
-        """Assign the return value of function to variable"""
-        if self.function is None:
-            raise GrootError("function undefined")
-        result = self._call_function()
+    def _function_assign(self, var_name: str, name: int) -> int:
+        """Assign the return value of a function to variable"""
+        result = self._call_function(name)
         self.variables[var_name] = result
         return result
 
@@ -108,15 +202,16 @@ class GrootInterpreter:
         self.variables[left_var] = result
         return result
     
-    def _call_function(self) -> int:
-        """Call the defined function"""
-        if self.function is None:
+    def _call_function(self, name: int) -> int:
+        """Call the function declared with this name"""
+        function = self.functions.get(name)
+        if function is None:
             raise GrootError("function undefined")
 
         saved_vars = self.variables.copy()  # Save current state for rollback
         try:
             result = 0
-            for stmt in self.function['body']:
+            for stmt in function['body']:
                 if stmt['type'] == 'RETURN':
                     # Return the value of the specified variable
                     result = self.variables[stmt['variable']]
@@ -143,10 +238,11 @@ class GrootInterpreter:
         except GrootError as e:
             error_occurred = True
             self.current_error = str(e)
+            self._count_error(self.current_error)
             # Catch block: handle error and run catch statements
             for catch_stmt in stmt['catch_body']:
                 if catch_stmt['type'] == 'ERROR_OUTPUT':
-                    print(f"-rocket: \"{self.current_error}\"")
+                    self.output(f"-rocket: \"{self.current_error}\"")
                 else:
                     self._execute_statement(catch_stmt)
         self.in_try_catch = False
@@ -155,14 +251,31 @@ class GrootInterpreter:
         if not error_occurred:
             for catch_stmt in stmt['catch_body']:
                 if catch_stmt['type'] == 'ERROR_OUTPUT':
-                    # Find the last variable value that was used
-                    last_value = self.variables['groot']  # Default to groot
-                    print(f"rocket: \"{last_value}\"")
+                    self._print_success_output()
                     break
 
+    def _print_success_output(self) -> int:
+        """Print the rocket line of a try/catch block that did not fail"""
+        # Find the last variable value that was used
+        last_value = self.variables['groot']  # Default to groot
+        self.output(f"rocket: \"{last_value}\"")
+        return last_value
+
+    def _count_error(self, error_message: str) -> None:
+        """Count an error by kind for metrics"""
+        kind = error_kind(error_message)
+        self.error_counts[kind] = self.error_counts.get(kind, 0) + 1
+
     def _handle_error(self, error_message: str) -> None:
         """Print error messages"""
-        print(f"rocket: Something went wrong! \"{error_message}\"")
+        self._count_error(error_message)
+        self.errors_reported += 1
+        self.output(f"rocket: Something went wrong! \"{error_message}\"")
+
+    def drop_caches(self) -> None:
+        """Forget the rewritten and decoded copies of the last program"""
+        self._optimized = None
+        self._encoded = None
 
     def get_variable_state(self) -> Dict[str, int]:
         """Get current state of all variables"""
@@ -174,6 +287,6 @@ class GrootInterpreter:
             'GROOT': 0,
             'groot': 0
         }
-        self.function = None
+        self.functions = {}
         self.in_try_catch = False
         self.current_error = None
\ No newline at end of file
@@ -1,8 +1,79 @@
+import argparse
+import sys
+from contextlib import ExitStack, closing, nullcontext
 from parser import GrootParser
 from interpreter import GrootInterpreter
-from ascii_art import get_colored_rocket, get_colored_groot
+from metrics import Metrics
+from memstats import MemoryStats
 
 def main():
+    arg_parser = argparse.ArgumentParser(description="Groot Language Interpreter")
+    arg_parser.add_argument('files', nargs='*',
+                            help=".groot files to run without the interactive prompt")
+    arg_parser.add_argument('--stats', action='store_true',
+                            help="print per-phase timings, statements executed and errors after each run")
+    arg_parser.add_argument('-j', '--jobs', type=int, default=1,
+                            help="run files across this many processes (0 = one per CPU)")
+    arg_parser.add_argument('--jsonl', action='store_true',
+                            help="print one JSON result per file (output, status, timing)")
+    arg_parser.add_argument('--memstats', action='store_true',
+                            help="print peak and retained memory per phase after each run (slower)")
+    arg_parser.add_argument('--fixed-width', action='store_true',
+                            help="keep values in 64-bit registers, falling back to big integers on overflow")
+    arg_parser.add_argument('--pipeline', action='store_true',
+                            help="start running each file while the rest is still being parsed")
+    args = arg_parser.parse_args()
+    metrics = Metrics() if args.stats else None
+    memstats = MemoryStats() if args.memstats else None
+
+    if args.files and (args.jobs != 1 or args.jsonl):
+        if args.stats:
+            # Each worker process would keep its own counters
+            arg_parser.error("--stats cannot be combined with -j/--jobs or --jsonl")
+        from runner import run_parallel
+        sys.exit(run_parallel(args.files, args.jobs, args.jsonl, args.memstats, args.fixed_width,
+                              args.pipeline))
+    if args.files:
+        sys.exit(run_files(args.files, metrics, memstats, args.fixed_width, args.pipeline))
+    repl(metrics, memstats, args.fixed_width)
+
+def run_files(filenames: list, metrics: Metrics = None, memstats: MemoryStats = None,
+              fixed_width: bool = False, pipeline: bool = False) -> int:
+    """
+    Run .groot files headlessly: no banner art, no prompt.
+    Each file gets a fresh interpreter; with pipeline, it starts running while
+    the rest of the file is tokenized and parsed. Returns the exit status: 0 if every
+    file ran cleanly, 1 if a program reported an error, 2 if a file could
+    not be read or failed to run.
+    """
+    status = 0
+    parser = GrootParser()
+    for filename in filenames:
+        try:
+            with open(filename, 'r') as file:
+                code = file.read()
+        except OSError as e:
+            print(f"Error: cannot read '{filename}': {e.strerror}", file=sys.stderr)
+            status = 2
+            continue
+        interpreter = GrootInterpreter(fixed_width=fixed_width)
+        if not execute_code(code, parser, interpreter, metrics=metrics, memstats=memstats,
+                            pipeline=pipeline, headless=True):
+            status = 2
+        elif interpreter.errors_reported and status == 0:
+            status = 1
+    if metrics:
+        print_stats(metrics, headless=True)
+    return status
+
+def repl(metrics: Metrics = None, memstats: MemoryStats = None, fixed_width: bool = False):
+    """Interactive interpreter with banner art and file commands"""
+    # Only the REPL needs these; headless runs never import them
+    from incremental import IncrementalParser
+    from state_index import StateIndex
+    from recorder import TraceRecorder, TraceReplay, replay_shell
+    from ascii_art import get_colored_rocket, get_colored_groot
+
     # Show rocket on startup - "launching" the interpreter
     print("\033[93mLaunching Groot Language Interpreter...\033[0m")
     print()
@@ -13,6 +84,9 @@ def main():
     print("\033[96mCommands:\033[0m")
     print("  \033[93m'exit'\033[0m - Quit the interpreter")
     print("  \033[93m'run <filename>'\033[0m - Execute a .groot file")
+    print("  \033[93m'state-at <filename> <line>'\033[0m - Show variable values after a line")
+    print("  \033[93m'trace <filename>'\033[0m - Execute a .groot file, recording <filename>.trace")
+    print("  \033[93m'replay <tracefile>'\033[0m - Step through a recorded trace")
     print("  \033[93m'vars'\033[0m - Show current variable values")
     print("  \033[93m'reset'\033[0m - Reset interpreter state")
     print("  \033[93m'help'\033[0m - Show a help message")
@@ -21,7 +95,9 @@ def main():
     print()
 
     parser = GrootParser()
-    interpreter = GrootInterpreter()
+    interpreter = GrootInterpreter(fixed_width=fixed_width)
+    # One incremental parser per file, so re-running an edited file only re-parses the edit
+    file_parsers = {}
 
     while True:
         try:
@@ -29,6 +105,8 @@ def main():
 
             # Exit the interpreter
             if user_input.lower() == 'exit':
+                if metrics:
+                    print_stats(metrics)
                 print("\033[92m")
                 print(get_colored_groot())
                 print("\033[0m")
@@ -76,7 +154,66 @@ def main():
                     with open(filename, 'r') as file:
                         code = file.read()
                         print(f"\033[93mLaunching {filename}...\033[0m")
-                    execute_code(code, parser, interpreter, show_groot_on_success=True)
+                    file_parser = file_parsers.setdefault(filename, IncrementalParser())
+                    execute_code(code, file_parser, interpreter, show_groot_on_success=True, metrics=metrics, memstats=memstats)
+                    if metrics:
+                        print_stats(metrics)
+                except FileNotFoundError:
+                    print(f"\033[91mError: File '{filename}' not found\033[0m")
+                except Exception as e:
+                    print(f"\033[91mError reading file: {e}\033[0m")
+                continue
+
+            # Run a Groot program while recording an execution trace
+            elif user_input.startswith('trace '):
+                filename = user_input[6:].strip()
+                try:
+                    with open(filename, 'r') as file:
+                        code = file.read()
+                        print(f"\033[93mLaunching {filename} with tracing...\033[0m")
+                    interpreter.trace = TraceRecorder(path=filename + '.trace')
+                    try:
+                        file_parser = file_parsers.setdefault(filename, IncrementalParser())
+                        execute_code(code, file_parser, interpreter, show_groot_on_success=True, metrics=metrics, memstats=memstats)
+                    finally:
+                        # Nothing ran, and the parser may be mid-edit, if the file did not parse
+                        located = interpreter.trace.located
+                        interpreter.trace.close(lines=file_parser.statement_lines() if located else None)
+                        interpreter.trace = None
+                    print(f"\033[94mTrace written to {filename}.trace\033[0m")
+                except FileNotFoundError:
+                    print(f"\033[91mError: File '{filename}' not found\033[0m")
+                except Exception as e:
+                    print(f"\033[91mError reading file: {e}\033[0m")
+                continue
+
+            # Step through a recorded trace without re-executing
+            elif user_input.startswith('replay '):
+                filename = user_input[7:].strip()
+                try:
+                    replay_shell(TraceReplay.from_file(filename))
+                except FileNotFoundError:
+                    print(f"\033[91mError: File '{filename}' not found\033[0m")
+                except Exception as e:
+                    print(f"\033[91mError reading trace: {e}\033[0m")
+                continue
+
+            # Show variable values after a line of a file, without running it
+            elif user_input.startswith('state-at '):
+                args = user_input[9:].split()
+                if len(args) != 2 or not args[1].isdigit():
+                    print("\033[91mUsage: state-at <filename> <line>\033[0m")
+                    continue
+                filename, line = args[0], int(args[1])
+                try:
+                    with open(filename, 'r') as file:
+                        code = file.read()
+                    file_parser = file_parsers.setdefault(filename, IncrementalParser())
+                    file_parser.tokenize(code)
+                    state = StateIndex(file_parser).state_at(line)
+                    print(f"\033[96mAfter line {line}:\033[0m")
+                    print(f"\033[96mGROOT = \033[93m{state['GROOT']}\033[0m")
+                    print(f"\033[96mgroot = \033[93m{state['groot']}\033[0m")
                 except FileNotFoundError:
                     print(f"\033[91mError: File '{filename}' not found\033[0m")
                 except Exception as e:
@@ -85,7 +222,7 @@ def main():
 
             # Execute single line or multi-line input as Groot code
             if user_input:
-                execute_code(user_input, parser, interpreter)
+                execute_code(user_input, parser, interpreter, metrics=metrics, memstats=memstats)
 
         except KeyboardInterrupt:
             print("\n\033[92mI am Groot! (Goodbye!)\033[0m")
@@ -96,26 +233,83 @@ def main():
         except Exception as e:
             print(f"Unexpected error: {e}")
 
-def execute_code(code: str, parser: GrootParser, interpreter: GrootInterpreter, show_groot_on_success: bool = False):
+def execute_code(code: str, parser: GrootParser, interpreter: GrootInterpreter, show_groot_on_success: bool = False,
+                 metrics: Metrics = None, memstats: MemoryStats = None, pipeline: bool = False,
+                 headless: bool = False):
     """
     Tokenize, parse, and execute Groot code.
     Handles syntax errors gracefully.
     Shows ASCII art on success if requested.
+    Records phase timings and counters when metrics is given, and prints
+    per-phase memory usage when memstats is given (on stderr when headless).
+    Returns False if the code could not be run.
     """
     try:
-        tokens = parser.tokenize(code)
-        if not tokens:
-            return
-        ast = parser.parse(tokens)
-        interpreter.interpret(ast)
+        run_phases(code, parser, interpreter, metrics, memstats, pipeline)
+        if memstats:
+            print_memstats(memstats, headless)
         
         # Show groot on successful execution of files
         if show_groot_on_success:
             print("\033[92mProgram completed successfully!\033[0m")
             print()
+        return True
             
     except Exception as e:
         print(f"\033[91msyntax error: {e}\033[0m")
+        return False
+
+def run_phases(code: str, parser: GrootParser, interpreter: GrootInterpreter,
+               metrics: Metrics = None, memstats: MemoryStats = None, pipeline: bool = False):
+    """
+    Tokenize, parse and interpret code, recording each phase in metrics
+    and/or memstats; shared with runner.run_file. Errors propagate.
+    With pipeline, statements run while later lines are still being parsed
+    on another thread (see pipeline.py); memory stats need the phases one
+    after another, so they turn pipelining off.
+    """
+    with metrics.counting(interpreter) if metrics else nullcontext():
+        if pipeline and not memstats:
+            # Only pipelined runs need the producer thread
+            from pipeline import pipelined
+            with phase('interpret', metrics), closing(pipelined(code, metrics)) as programs:
+                interpreter.interpret_stream(programs)
+            return
+        with phase('tokenize', metrics, memstats):
+            tokens = parser.tokenize(code)
+        if memstats:
+            memstats.statements = len(tokens)
+        if tokens:
+            with phase('parse', metrics, memstats):
+                ast = parser.parse(tokens)
+            with phase('interpret', metrics, memstats):
+                interpreter.interpret(ast)
+
+def phase(name: str, metrics: Metrics = None, memstats: MemoryStats = None) -> ExitStack:
+    """Time and/or memory-account one phase, for whichever of the two is on"""
+    stack = ExitStack()
+    if metrics:
+        stack.enter_context(metrics.time(name))
+    if memstats:
+        stack.enter_context(memstats.measure(name))
+    return stack
+
+def print_memstats(memstats: MemoryStats, headless: bool = False):
+    """Print the --memstats results of the last run; plain and on stderr when headless, like --stats"""
+    out = sys.stderr if headless else sys.stdout
+    print("Memory:" if headless else "\033[96mMemory:\033[0m", file=out)
+    for line in memstats.summary().split('\n'):
+        print(f"  {line}", file=out)
+
+def print_stats(metrics: Metrics, headless: bool = False):
+    """
+    Print the accumulated --stats counters. Headless runs print them plain,
+    on stderr, so they stay out of the program's output.
+    """
+    out = sys.stderr if headless else sys.stdout
+    print("Stats:" if headless else "\033[96mStats:\033[0m", file=out)
+    for line in metrics.summary().split('\n'):
+        print(f"  {line}", file=out)
 
 def print_help():
     """
@@ -139,17 +333,18 @@ Operations:
 Assignments:
   - I am groot, I am GROOT         (groot = GROOT)
   - I am GROOT, I am groot         (GROOT = groot)
-  - I am groot, I am... Groot      (groot = function())
+  - I am groot, I am... Groot      (groot = function 3())
 
 Arithmetic:
   - I am groot! I am GROOT         (groot += GROOT)
   - I am groot? I am GROOT         (groot -= GROOT)
 
-Functions:
-  - I am... Groot,                 (function declaration start)
+Functions (named by their number of dots, three or more):
+  - I am... Groot,                 (function 3 declaration start)
       [indented statements]
       I am groot.                  (return groot)
-  - I am... Groot                  (function call)
+  - I am.... Groot,                (function 4 declaration start)
+  - I am... Groot                  (call function 3)
 
 Error Handling:
   - I am groot???                  (try block start)
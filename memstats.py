@@ -0,0 +1,77 @@
+from contextlib import contextmanager
+from typing import Dict, List
+
+# Allocation sites listed per phase in the report
+TOP_SITES = 3
+
+class MemoryStats:
+    """
+    Per-phase memory accounting with tracemalloc.
+    For each phase of the last run, records the peak memory allocated while
+    it ran and what it left allocated afterwards, plus the source lines that
+    hold most of the retained memory. tracemalloc is only running inside a
+    measured phase, so nothing is paid when memory stats are off.
+    """
+    def __init__(self):
+        self.phases: Dict[str, dict] = {}
+        # Statements in the last run, for the bytes-per-statement figures
+        self.statements = 0
+
+    @contextmanager
+    def measure(self, phase: str):
+        """Record the peak and retained memory of the enclosed block as phase"""
+        # Imported here so that runs without memory stats never load it
+        import tracemalloc
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            after, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            if started:
+                tracemalloc.stop()
+            sites = snapshot.filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ]).statistics('lineno')[:TOP_SITES]
+            self.phases[phase] = {
+                'peak': peak - before,
+                'retained': after - before,
+                'top': [(f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size)
+                        for stat in sites],
+            }
+
+    def report(self) -> dict:
+        """Plain-dict results: bytes per phase and per statement"""
+        statements = max(self.statements, 1)
+        return {
+            'statements': self.statements,
+            'phases': {
+                phase: dict(stats, peak_per_statement=stats['peak'] / statements,
+                            retained_per_statement=stats['retained'] / statements)
+                for phase, stats in self.phases.items()
+            },
+        }
+
+    def summary(self) -> str:
+        """Human-readable results for the command line"""
+        lines: List[str] = []
+        statements = max(self.statements, 1)
+        for phase, stats in self.phases.items():
+            lines.append(f"{phase:<10} peak {_size(stats['peak']):>9}  retained {_size(stats['retained']):>9}  "
+                         f"per statement {stats['peak'] / statements:8.1f}B peak "
+                         f"{stats['retained'] / statements:8.1f}B retained")
+            for site, size in stats['top']:
+                lines.append(f"  {_size(size):>9}  {site}")
+        lines.append(f"statements: {self.statements}")
+        return '\n'.join(lines)
+
+def _size(count: int) -> str:
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(count) < 1024 or unit == 'MiB':
+            return f"{count:.0f}{unit}" if unit == 'B' else f"{count:.1f}{unit}"
+        count /= 1024
@@ -0,0 +1,116 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implied
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """Fixed-bucket histogram in the Prometheus style"""
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class Metrics:
+    """
+    Low-overhead counters for the execution pipeline.
+    Tracks per-phase latency histograms, statements executed and errors by
+    kind, and renders them as Prometheus text or a short CLI summary.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.phases: Dict[str, Histogram] = {}
+        self.statements = 0
+        self.errors: Dict[str, int] = {}
+        # Gauges are read when rendering: name -> (help, callback)
+        self.gauges: Dict[str, tuple] = {}
+
+    def observe(self, phase: str, seconds: float):
+        with self.lock:
+            histogram = self.phases.get(phase)
+            if histogram is None:
+                histogram = self.phases[phase] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, phase: str):
+        """Time the enclosed block as one observation of phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - start)
+
+    def count_execution(self, statements: int, errors: Dict[str, int]):
+        """Add the statements executed and errors raised by one run"""
+        with self.lock:
+            self.statements += statements
+            for kind, count in errors.items():
+                if count:
+                    self.errors[kind] = self.errors.get(kind, 0) + count
+
+    @contextmanager
+    def counting(self, interpreter):
+        """Count the statements executed and errors raised inside the block"""
+        statements = interpreter.statements_executed
+        errors = dict(interpreter.error_counts)
+        try:
+            yield
+        finally:
+            self.count_execution(
+                interpreter.statements_executed - statements,
+                {kind: count - errors.get(kind, 0) for kind, count in interpreter.error_counts.items()}
+            )
+
+    def gauge(self, name: str, help: str, callback: Callable[[], float]):
+        self.gauges[name] = (help, callback)
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines: List[str] = []
+        with self.lock:
+            lines.append('# HELP groot_phase_seconds Time spent in each execution phase')
+            lines.append('# TYPE groot_phase_seconds histogram')
+            for phase, histogram in sorted(self.phases.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + ('+Inf',), histogram.counts):
+                    cumulative += count
+                    lines.append(f'groot_phase_seconds_bucket{{phase="{phase}",le="{bound}"}} {cumulative}')
+                lines.append(f'groot_phase_seconds_sum{{phase="{phase}"}} {histogram.sum}')
+                lines.append(f'groot_phase_seconds_count{{phase="{phase}"}} {histogram.count}')
+
+            lines.append('# HELP groot_statements_executed_total Statements executed by the interpreter')
+            lines.append('# TYPE groot_statements_executed_total counter')
+            lines.append(f'groot_statements_executed_total {self.statements}')
+
+            lines.append('# HELP groot_errors_total Groot errors by kind')
+            lines.append('# TYPE groot_errors_total counter')
+            for kind, count in sorted(self.errors.items()):
+                lines.append(f'groot_errors_total{{kind="{kind}"}} {count}')
+
+        for name, (help, callback) in sorted(self.gauges.items()):
+            lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {callback()}')
+        return '\n'.join(lines) + '\n'
+
+    def summary(self) -> str:
+        """Human-readable totals for the command line"""
+        lines = []
+        with self.lock:
+            for phase, histogram in sorted(self.phases.items()):
+                mean = histogram.sum / histogram.count if histogram.count else 0.0
+                lines.append(f"{phase:<10} n={histogram.count:<5} total {histogram.sum * 1000:9.2f}ms  mean {mean * 1000:8.3f}ms")
+            lines.append(f"statements executed: {self.statements}")
+            errors = ', '.join(f"{kind}={count}" for kind, count in sorted(self.errors.items()))
+            lines.append(f"errors: {errors or 'none'}")
+        return '\n'.join(lines)
@@ -1,5 +1,5 @@
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
 # Token class represents a single token in the Groot language
 class Token:
@@ -12,6 +12,25 @@ class Token:
     def __repr__(self):
         return f"Token({self.type}, {self.value}, line={self.line}, indent={self.indent})"
 
+# Token (type, value) for every fixed spelling of a line, so common lines are
+# tokenized with one dict lookup; only the remaining forms (dotted function
+# lines, repeated ! or ?, unknown lines) go through the regular expressions
+LINE_TABLE = {
+    'I am Groot???': ('TRY_START', 'I am Groot???'),
+    'I am Groot!!!': ('CATCH_START', 'I am Groot!!!'),
+    'I am Groot!!!.': ('ERROR_OUTPUT', 'I am Groot!!!.'),
+}
+for _left in ('GROOT', 'groot'):
+    LINE_TABLE[f'I am {_left}'] = ('PRINT', _left)
+    LINE_TABLE[f'I am {_left}!'] = ('INCREMENT', _left)
+    LINE_TABLE[f'I am {_left}?'] = ('DECREMENT', _left)
+    LINE_TABLE[f'I am {_left}.'] = ('RETURN', _left)
+    for _right in ('GROOT', 'groot'):
+        LINE_TABLE[f'I am {_left}, I am {_right}'] = ('ASSIGN', f'{_left},{_right}')
+        LINE_TABLE[f'I am {_left}! I am {_right}'] = ('ADD', f'{_left},{_right}')
+        LINE_TABLE[f'I am {_left}? I am {_right}'] = ('SUBTRACT', f'{_left},{_right}')
+del _left, _right
+
 class GrootParser:
     def __init__(self):
         self.tokens = []
@@ -28,44 +47,56 @@ class GrootParser:
         lines = code.split('\n')
         for line in lines:
             self.line_number += 1
-            # Skip empty or comment-only lines (full-line comments)
-            if not line.strip():
-                continue
-            if line.strip().startswith('#'):
-                continue
-            # Remove inline comments (only after checking for full-line comment)
-            if '#' in line:
-                line = line.split('#', 1)[0]
-            # Calculate indentation (for block structure)
-            indent = len(line) - len(line.lstrip())
-            line_content = line.strip()
-            if not line_content:
-                continue
-            # Tokenize the line
-            self._tokenize_line(line_content, indent)
+            self._tokenize_source_line(line)
         return self.tokens
 
+    def _tokenize_source_line(self, line: str):
+        """
+        Tokenize one raw source line (numbered by self.line_number).
+        Appends at most one token; blank and comment lines produce none.
+        """
+        # Skip empty or comment-only lines (full-line comments)
+        if not line.strip():
+            return
+        if line.strip().startswith('#'):
+            return
+        # Remove inline comments (only after checking for full-line comment)
+        if '#' in line:
+            line = line.split('#', 1)[0]
+        # Calculate indentation (for block structure)
+        indent = len(line) - len(line.lstrip())
+        line_content = line.strip()
+        if not line_content:
+            return
+        # Tokenize the line
+        self._tokenize_line(line_content, indent)
+
     def _tokenize_line(self, line: str, indent: int):
         """
         Tokenize a single line of Groot code.
         Uses regex to match known patterns and delegates to helpers.
         """
+        entry = LINE_TABLE.get(line)
+        if entry is not None:
+            self.tokens.append(Token(entry[0], entry[1], self.line_number, indent))
+            return
+
         # Variable operations: increment, decrement, print
         if re.match(r'^I am (GROOT|groot)[\?\!]*$', line):
             self._parse_variable_operation(line, indent)
             
         # Variable assignments (including function assignment)
-        elif re.match(r'^I am (GROOT|groot), I am(\ GROOT|\ groot|\.\.\. Groot)$', line):
+        elif re.match(r'^I am (GROOT|groot), I am(\ GROOT|\ groot|\.{3,} Groot)$', line):
             self._parse_assignment(line, indent)
         # Binary operations (add/subtract)
         elif re.match(r'^I am (GROOT|groot)[\?\!] I am (GROOT|groot)$', line):
             self._parse_binary_operation(line, indent)
-        # Function declaration (start)
-        elif re.match(r'^I am\.\.\.\ Groot,$', line):
-            self.tokens.append(Token('FUNCTION_DECL', line, self.line_number, indent))
+        # Function declaration (start); the number of dots names the function
+        elif re.match(r'^I am\.{3,}\ Groot,$', line):
+            self.tokens.append(Token('FUNCTION_DECL', str(line.count('.')), self.line_number, indent))
         # Function call
-        elif re.match(r'^I am\.\.\.\ Groot$', line):
-            self.tokens.append(Token('FUNCTION_CALL', line, self.line_number, indent))
+        elif re.match(r'^I am\.{3,}\ Groot$', line):
+            self.tokens.append(Token('FUNCTION_CALL', str(line.count('.')), self.line_number, indent))
         # Try block (start)
         elif re.match(r'^I am Groot\?\?\?$', line):
             self.tokens.append(Token('TRY_START', line, self.line_number, indent))
@@ -104,9 +135,9 @@ class GrootParser:
         """
         parts = line.split(', ')
         left_var = 'GROOT' if 'GROOT' in parts[0] else 'groot'
-        if 'I am... Groot' in parts[1]:
-            # Function assignment (e.g., groot = function())
-            self.tokens.append(Token('FUNC_ASSIGN', left_var, self.line_number, indent))
+        if parts[1].endswith('. Groot'):
+            # Function assignment (e.g., groot = function()); value is "var,name"
+            self.tokens.append(Token('FUNC_ASSIGN', f"{left_var},{parts[1].count('.')}", self.line_number, indent))
         else:
             # Variable assignment (e.g., groot = GROOT)
             right_var = 'GROOT' if 'GROOT' in parts[1] else 'groot'
@@ -140,17 +171,67 @@ class GrootParser:
         ast = {
             'type': 'PROGRAM',
             'statements': [],
-            'function': None
+            'functions': {}
         }
         while self.current_token < len(self.tokens):
             stmt = self._parse_statement()
             if stmt:
                 if stmt['type'] == 'FUNCTION_DECL':
-                    ast['function'] = stmt
+                    # Declaring a name again replaces the earlier definition
+                    ast['functions'][stmt['name']] = stmt
                 else:
                     ast['statements'].append(stmt)
         return ast
     
+    def parse_stream(self, code: str, chunk_lines: int = 1024) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """
+        Tokenize and parse code a chunk of lines at a time.
+        Yields (program, lines) as soon as each chunk is parsed: a PROGRAM node
+        with the top-level statements and functions completed so far, and how
+        many source lines are now fully parsed. A block still open at the end
+        of a chunk is parsed again with the next one, which is twice as large,
+        so even a block spanning the whole file is re-parsed only a few times.
+        Together the programs hold what parse(tokenize(code)) would return.
+        """
+        self.tokens = []
+        self.current_token = 0
+        self.line_number = 0
+        lines = code.split('\n')
+        position = 0
+        size = chunk_lines
+        while position < len(lines):
+            for line in lines[position:position + size]:
+                self.line_number += 1
+                self._tokenize_source_line(line)
+            position += size
+            more = position < len(lines)
+            program = {
+                'type': 'PROGRAM',
+                'statements': [],
+                'functions': {}
+            }
+            open_block = False
+            while self.current_token < len(self.tokens):
+                start = self.current_token
+                stmt = self._parse_statement()
+                # A block that ran into the end of the tokens may go on in the next chunk
+                if more and self.current_token == len(self.tokens) and \
+                        self.tokens[start].type in ('FUNCTION_DECL', 'TRY_START'):
+                    self.current_token = start
+                    open_block = True
+                    break
+                if stmt:
+                    if stmt['type'] == 'FUNCTION_DECL':
+                        program['functions'][stmt['name']] = stmt
+                    else:
+                        program['statements'].append(stmt)
+            size = size * 2 if open_block else chunk_lines
+            # Parsed tokens are done with; keep only an unfinished block
+            del self.tokens[:self.current_token]
+            self.current_token = 0
+            parsed = self.tokens[0].line - 1 if self.tokens else self.line_number
+            yield program, parsed
+
     def _parse_statement(self) -> Optional[Dict[str, Any]]:
         """
         Parse a single statement from the token stream.
@@ -174,7 +255,8 @@ class GrootParser:
             return {'type': 'ASSIGN', 'left': vars[0], 'right': vars[1]}
         elif token.type == 'FUNC_ASSIGN':
             self.current_token += 1
-            return {'type': 'FUNC_ASSIGN', 'variable': token.value}
+            var, name = token.value.split(',')
+            return {'type': 'FUNC_ASSIGN', 'variable': var, 'function': int(name)}
         elif token.type == 'ADD':
             self.current_token += 1
             vars = token.value.split(',')
@@ -187,7 +269,7 @@ class GrootParser:
             return self._parse_function()
         elif token.type == 'FUNCTION_CALL':
             self.current_token += 1
-            return {'type': 'FUNCTION_CALL'}
+            return {'type': 'FUNCTION_CALL', 'function': int(token.value)}
         elif token.type == 'TRY_START':
             return self._parse_try_catch()
         elif token.type == 'RETURN':
@@ -201,7 +283,9 @@ class GrootParser:
         """
         Parse a function declaration block.
         Collects all indented statements as the function body.
+        Functions are named by the number of dots after 'I am' (3 or more).
         """
+        name = int(self.tokens[self.current_token].value)
         self.current_token += 1  # Skip FUNCTION_DECL
         function_body = []
         base_indent = None
@@ -222,6 +306,7 @@ class GrootParser:
                     function_body.append(stmt)
         return {
             'type': 'FUNCTION_DECL',
+            'name': name,
             'body': function_body
         }
     
@@ -0,0 +1,79 @@
+import queue
+import threading
+from contextlib import nullcontext
+from typing import Dict, Any, Iterator, Optional
+from parser import GrootParser
+from metrics import Metrics
+
+# Source lines tokenized and parsed per piece
+CHUNK_LINES = 1024
+# Parsed pieces the front end may run ahead of the interpreter
+QUEUE_PIECES = 8
+
+_DONE = object()
+
+def declarations_end(code: str) -> int:
+    """
+    Source line of the last possible function declaration, 0 if none.
+    A plain text search, so it may also stop at a comment; it never misses one.
+    """
+    offset = code.rfind('. Groot,')
+    return code.count('\n', 0, offset) + 1 if offset >= 0 else 0
+
+def pipelined(code: str, metrics: Optional[Metrics] = None, chunk_lines: int = CHUNK_LINES,
+              depth: int = QUEUE_PIECES) -> Iterator[Dict[str, Any]]:
+    """
+    Tokenize and parse code on a producer thread, yielding the program in
+    pieces for GrootInterpreter.interpret_stream while later lines are still
+    being parsed. At most depth pieces wait in the queue between the two.
+    A call may name a function declared further down the file, so statements
+    are held back until the last declaration has been parsed; after that,
+    each piece is handed over as soon as it is ready.
+    The front end's own time is recorded as the 'frontend' phase in metrics.
+    Close the generator to stop the producer early.
+    """
+    pieces = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            with metrics.time('frontend') if metrics else nullcontext():
+                declared = declarations_end(code)
+                held = None
+                for program, parsed in GrootParser().parse_stream(code, chunk_lines):
+                    if stop.is_set():
+                        return
+                    if held is not None:
+                        held['statements'].extend(program['statements'])
+                        held['functions'].update(program['functions'])
+                        program = held
+                    if parsed < declared:
+                        held = program
+                        continue
+                    held = None
+                    pieces.put(program)
+                if held is not None:
+                    pieces.put(held)
+        except BaseException as e:
+            pieces.put(e)
+        pieces.put(_DONE)
+
+    producer = threading.Thread(target=produce, name='groot-frontend', daemon=True)
+    producer.start()
+    try:
+        while True:
+            piece = pieces.get()
+            if piece is _DONE:
+                break
+            if isinstance(piece, BaseException):
+                raise piece
+            yield piece
+    finally:
+        stop.set()
+        # Free the queue so a producer blocked on put sees stop and exits
+        while producer.is_alive():
+            try:
+                pieces.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        producer.join()
@@ -0,0 +1,241 @@
+import json
+import mmap
+import struct
+import sys
+from typing import List, Dict, Any, Optional
+
+# Fixed-size trace record: statement id, flags, GROOT, groot
+RECORD = struct.Struct('<IBqq')
+# File header: magic, capacity, sample interval, total records written
+HEADER = struct.Struct('<4sIIQ')
+MAGIC = b'GRTR'
+
+FLAG_ERROR = 1      # the statement raised a Groot error
+FLAG_OVERFLOW = 2   # a value did not fit in 64 bits; see the overflow table
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+def describe(stmt: Dict[str, Any]) -> str:
+    """Render a statement back as Groot source"""
+    stype = stmt['type']
+    if stype == 'INCREMENT':
+        return f"I am {stmt['variable']}!"
+    elif stype in ('DECREMENT', 'DECREMENT_UNCHECKED'):
+        return f"I am {stmt['variable']}?"
+    elif stype == 'PRINT':
+        return f"I am {stmt['variable']}"
+    elif stype == 'ASSIGN':
+        return f"I am {stmt['left']}, I am {stmt['right']}"
+    elif stype == 'FUNC_ASSIGN':
+        return f"I am {stmt['variable']}, I am{'.' * stmt['function']} Groot"
+    elif stype == 'ADD':
+        return f"I am {stmt['left']}! I am {stmt['right']}"
+    elif stype in ('SUBTRACT', 'SUBTRACT_UNCHECKED'):
+        return f"I am {stmt['left']}? I am {stmt['right']}"
+    elif stype == 'FUNCTION_CALL':
+        return f"I am{'.' * stmt['function']} Groot"
+    elif stype == 'TRY_CATCH':
+        return "I am Groot???"
+    elif stype == 'RETURN':
+        return f"I am {stmt['variable']}."
+    elif stype == 'SUCCESS_OUTPUT':
+        return "I am Groot!!!."
+    return stype
+
+class TraceRecorder:
+    """
+    Records (statement id, resulting values) for every executed statement
+    into a preallocated ring buffer, so memory stays bounded on long runs.
+    With a path the buffer is a memory-mapped file that survives a crash;
+    call close() to also write the statement table next to it.
+    The table keeps each statement's text and the position of the top-level
+    statement it belongs to, so identical lines stay apart in a replay.
+    """
+    def __init__(self, capacity: int = 65536, sample_every: int = 1, path: Optional[str] = None):
+        self.capacity = capacity
+        self.sample_every = sample_every
+        self.path = path
+        self.count = 0      # records written
+        self.executed = 0   # statements seen, sampled or not
+        self.statement_ids = {}
+        self.statements: List[Dict[str, Any]] = []
+        # Top-level position of every statement located so far, by id
+        self.positions = {}
+        self.located = 0
+        # Values that do not fit in 64 bits, by record sequence number
+        self.overflow = {}
+
+        size = HEADER.size + capacity * RECORD.size
+        if path:
+            self._file = open(path, 'w+b')
+            self._file.truncate(size)
+            self.buffer = mmap.mmap(self._file.fileno(), size)
+        else:
+            self._file = None
+            self.buffer = bytearray(size)
+        HEADER.pack_into(self.buffer, 0, MAGIC, capacity, sample_every, 0)
+
+    def locate(self, statements: List[Dict[str, Any]]):
+        """
+        Number the next top-level statements about to run, on from earlier
+        pieces of the same run; statements in their try/catch blocks share
+        the number. Function bodies are left unnumbered.
+        """
+        for stmt in statements:
+            self._locate(stmt, self.located)
+            self.located += 1
+
+    def _locate(self, stmt: Dict[str, Any], position: int):
+        self.positions[id(stmt)] = position
+        if stmt['type'] == 'TRY_CATCH':
+            for inner in stmt['try_body'] + stmt['catch_body']:
+                self._locate(inner, position)
+
+    def record(self, stmt: Dict[str, Any], variables: Dict[str, int], error: bool = False):
+        """Record the values after stmt (errors are always kept when sampling)"""
+        self.executed += 1
+        if not error and self.executed % self.sample_every:
+            return
+        sid = self.statement_ids.get(id(stmt))
+        if sid is None:
+            sid = self.statement_ids[id(stmt)] = len(self.statements)
+            self.statements.append({'text': describe(stmt), 'position': self.positions.get(id(stmt))})
+
+        flags = FLAG_ERROR if error else 0
+        upper, lower = variables['GROOT'], variables['groot']
+        self.overflow.pop(self.count - self.capacity, None)
+        if not (INT64_MIN < upper <= INT64_MAX and INT64_MIN < lower <= INT64_MAX):
+            flags |= FLAG_OVERFLOW
+            self.overflow[self.count] = (upper, lower)
+            upper = lower = INT64_MIN
+        slot = self.count % self.capacity
+        RECORD.pack_into(self.buffer, HEADER.size + slot * RECORD.size, sid, flags, upper, lower)
+        self.count += 1
+        HEADER.pack_into(self.buffer, 0, MAGIC, self.capacity, self.sample_every, self.count)
+
+    def close(self, lines: Optional[List[int]] = None):
+        """
+        Flush a file-backed trace and write its statement table.
+        lines gives the source line each top-level statement starts on.
+        """
+        if self._file:
+            self.buffer.flush()
+            self.buffer.close()
+            self._file.close()
+            self._file = None
+            with open(self.path + '.json', 'w') as file:
+                json.dump({
+                    'statements': self.statements,
+                    'lines': lines,
+                    'overflow': {str(seq): values for seq, values in self.overflow.items()}
+                }, file)
+
+class TraceReplay:
+    """
+    Steps forward and backward through a recorded trace without re-executing.
+    Only the last `capacity` records are kept, oldest first. With lines, each
+    record also carries the source line its top-level statement starts on.
+    """
+    def __init__(self, buffer, statements: List[Dict[str, Any]], overflow: Dict[int, tuple],
+                 lines: Optional[List[int]] = None):
+        _, capacity, _, count = HEADER.unpack_from(buffer, 0)
+        first = max(count - capacity, 0)
+        self.records = []
+        for seq in range(first, count):
+            slot = seq % capacity
+            sid, flags, upper, lower = RECORD.unpack_from(buffer, HEADER.size + slot * RECORD.size)
+            if flags & FLAG_OVERFLOW:
+                upper, lower = overflow[seq]
+            position = statements[sid]['position']
+            self.records.append({
+                'index': seq,
+                'statement': statements[sid]['text'],
+                'position': position,
+                'line': lines[position] if lines and position is not None and position < len(lines) else None,
+                'GROOT': upper,
+                'groot': lower,
+                'error': bool(flags & FLAG_ERROR)
+            })
+        self.position = 0
+
+    @classmethod
+    def from_recorder(cls, recorder: TraceRecorder, lines: Optional[List[int]] = None) -> 'TraceReplay':
+        return cls(recorder.buffer, recorder.statements, recorder.overflow, lines)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'TraceReplay':
+        """Load a trace written by a file-backed TraceRecorder"""
+        with open(path, 'rb') as file:
+            buffer = file.read()
+        magic = HEADER.unpack_from(buffer, 0)[0]
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a Groot trace")
+        with open(path + '.json') as file:
+            table = json.load(file)
+        overflow = {int(seq): tuple(values) for seq, values in table['overflow'].items()}
+        return cls(buffer, table['statements'], overflow, table['lines'])
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def current(self) -> Optional[Dict[str, Any]]:
+        return self.records[self.position] if self.records else None
+
+    def step(self, count: int = 1) -> Optional[Dict[str, Any]]:
+        return self.seek(self.position + count)
+
+    def back(self, count: int = 1) -> Optional[Dict[str, Any]]:
+        return self.seek(self.position - count)
+
+    def seek(self, position: int) -> Optional[Dict[str, Any]]:
+        self.position = min(max(position, 0), max(len(self.records) - 1, 0))
+        return self.current()
+
+    def next_error(self) -> Optional[Dict[str, Any]]:
+        """Jump to the next record whose statement failed"""
+        for position in range(self.position + 1, len(self.records)):
+            if self.records[position]['error']:
+                return self.seek(position)
+        return None
+
+def replay_shell(replay: TraceReplay):
+    """Interactive stepping through a trace"""
+    print(f"\033[96m{len(replay)} records. Commands: n [k], p [k], g <i>, e (next error), q\033[0m")
+    while replay.records:
+        record = replay.current()
+        marker = " \033[91m(error)\033[0m" if record['error'] else ""
+        if record['line'] is not None:
+            where = f"line {record['line']}: "
+        elif record['position'] is not None:
+            where = f"statement {record['position'] + 1}: "
+        else:
+            where = "in a function: "
+        print(f"[{replay.position}] {where}\033[93m{record['statement']}\033[0m"
+              f"  GROOT = {record['GROOT']}, groot = {record['groot']}{marker}")
+        try:
+            command = input("replay> ").split()
+        except (KeyboardInterrupt, EOFError):
+            print()
+            break
+        if not command:
+            replay.step()
+        elif command[0] == 'q':
+            break
+        elif command[0] in ('n', 'p', 'g') and len(command) > 1 and not command[1].isdigit():
+            print("\033[91mExpected a number\033[0m")
+        elif command[0] == 'n':
+            replay.step(int(command[1]) if len(command) > 1 else 1)
+        elif command[0] == 'p':
+            replay.back(int(command[1]) if len(command) > 1 else 1)
+        elif command[0] == 'g' and len(command) > 1:
+            replay.seek(int(command[1]))
+        elif command[0] == 'e':
+            if replay.next_error() is None:
+                print("\033[94mNo further errors\033[0m")
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python recorder.py <tracefile>")
+        sys.exit(2)
+    replay_shell(TraceReplay.from_file(sys.argv[1]))
@@ -0,0 +1,117 @@
+from array import array
+from typing import List, Dict, Any, Tuple
+
+# Register numbers of the two variables
+SLOTS = {'GROOT': 0, 'groot': 1}
+
+# Opcodes, roughly in order of how often they run
+INCREMENT, ADD, PRINT, ASSIGN, DECREMENT_UNCHECKED, SUBTRACT_UNCHECKED, DECREMENT, SUBTRACT, NOP, OTHER = range(10)
+
+OPCODES = {
+    'INCREMENT': INCREMENT,
+    'ADD': ADD,
+    'PRINT': PRINT,
+    'ASSIGN': ASSIGN,
+    'DECREMENT_UNCHECKED': DECREMENT_UNCHECKED,
+    'SUBTRACT_UNCHECKED': SUBTRACT_UNCHECKED,
+    'DECREMENT': DECREMENT,
+    'SUBTRACT': SUBTRACT,
+    'RETURN': NOP,
+}
+
+Instruction = Tuple[int, int, int, Dict[str, Any]]
+
+def encode(statements: List[Dict[str, Any]]) -> List[Instruction]:
+    """
+    Decode top-level statements once into (opcode, register, register, stmt).
+    Calls, try/catch blocks and anything else become OTHER and are handed
+    to the interpreter as they are.
+    """
+    code = []
+    for stmt in statements:
+        op = OPCODES.get(stmt['type'], OTHER)
+        if op in (INCREMENT, PRINT, DECREMENT_UNCHECKED, DECREMENT):
+            code.append((op, SLOTS[stmt['variable']], 0, stmt))
+        elif op in (ADD, ASSIGN, SUBTRACT_UNCHECKED, SUBTRACT):
+            code.append((op, SLOTS[stmt['left']], SLOTS[stmt['right']], stmt))
+        else:
+            code.append((op, 0, 0, stmt))
+    return code
+
+def run(interpreter, code: List[Instruction]) -> None:
+    """
+    Execute decoded top-level statements with the variables held in a
+    signed 64-bit register file. Storing a value that does not fit raises
+    OverflowError inside array itself, which is the whole overflow check:
+    the statement that overflowed and everything after it then run on the
+    interpreter's normal arbitrary-precision path.
+    Must be called outside any try block, with tracing off.
+    """
+    try:
+        registers = array('q', (interpreter.variables['GROOT'], interpreter.variables['groot']))
+    except OverflowError:
+        position = 0
+    else:
+        position = _run_registers(interpreter, code, registers)
+
+    # Out of range: the rest runs on Python ints
+    for _, _, _, stmt in code[position:]:
+        interpreter._execute_statement(stmt)
+
+def _run_registers(interpreter, code: List[Instruction], registers: array) -> int:
+    """Run code until it ends or overflows; returns how many statements ran"""
+    position = 0
+    executed = 0
+    # True while interpreter.variables, not the registers, hold the values
+    synced = False
+    output = interpreter.output
+    try:
+        for op, a, b, stmt in code:
+            if op == OTHER:
+                # Hand the statement to the interpreter with the registers written back
+                variables = interpreter.variables
+                variables['GROOT'], variables['groot'] = registers
+                synced = True
+                interpreter._execute_statement(stmt)
+                position += 1
+                variables = interpreter.variables
+                try:
+                    registers[0] = variables['GROOT']
+                    registers[1] = variables['groot']
+                except OverflowError:
+                    return position
+                synced = False
+                continue
+            try:
+                if op == INCREMENT:
+                    registers[a] += 1
+                elif op == ADD:
+                    registers[a] += registers[b]
+                elif op == PRINT:
+                    output(str(registers[a]))
+                elif op == ASSIGN:
+                    registers[a] = registers[b]
+                elif op == DECREMENT_UNCHECKED:
+                    registers[a] -= 1
+                elif op == SUBTRACT_UNCHECKED:
+                    registers[a] -= registers[b]
+                elif op == DECREMENT:
+                    if registers[a] <= 0:
+                        interpreter._handle_error("negative value prevented")
+                    else:
+                        registers[a] -= 1
+                elif op == SUBTRACT:
+                    if registers[a] < registers[b]:
+                        interpreter._handle_error("negative value prevented")
+                    else:
+                        registers[a] -= registers[b]
+            except OverflowError:
+                break
+            executed += 1
+            position += 1
+        return position
+    finally:
+        if not synced:
+            variables = interpreter.variables
+            variables['GROOT'], variables['groot'] = registers
+        interpreter.statements_executed += executed
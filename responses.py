@@ -0,0 +1,89 @@
+import gzip
+import hashlib
+import threading
+from typing import Callable, List, Tuple
+from flask import Response
+from werkzeug.http import parse_accept_header, parse_etags
+from werkzeug.utils import get_content_type
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+class PrecomputedResponse:
+    """
+    A response body built once and kept in every encoding we serve:
+    identity, gzip and, when the brotli package is installed, br.
+    Nothing is built until first needed, and each encoding is compressed
+    the first time a client asks for it, so a cold start only pays for what
+    its first request uses.
+    Each encoding gets its own strong ETag, and a matching If-None-Match
+    is answered with 304 Not Modified and no body.
+    """
+    def __init__(self, build: Callable[[], bytes], mimetype: str, cache_control: str):
+        self.build = build
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        self.encodings = ('br', 'gzip') if brotli is not None else ('gzip',)
+        self.lock = threading.Lock()
+        # encoding -> (body, etag); None is the uncompressed body
+        self.variants = {}
+
+    def _variant(self, encoding):
+        variant = self.variants.get(encoding)
+        if variant is None:
+            with self.lock:
+                if None not in self.variants:
+                    body = self.build()
+                    self.variants[None] = (body, hashlib.sha256(body).hexdigest()[:32])
+                body, digest = self.variants[None]
+                if encoding not in self.variants:
+                    if encoding == 'gzip':
+                        # mtime=0 keeps the gzip bytes, and so the ETag, stable across restarts
+                        self.variants[encoding] = (gzip.compress(body, 9, mtime=0), digest + '-gzip')
+                    else:
+                        self.variants[encoding] = (brotli.compress(body), digest + '-br')
+                variant = self.variants[encoding]
+        return variant
+
+    def warm(self):
+        """Build every encoding now rather than on first request"""
+        for encoding in (None,) + self.encodings:
+            self._variant(encoding)
+
+    def _encoding(self, accepted):
+        """Best encoding the client accepts, smallest first"""
+        for encoding in self.encodings:
+            if accepted[encoding]:
+                return encoding
+        return None
+
+    def serve(self, request) -> Response:
+        encoding = self._encoding(request.accept_encodings)
+        body, etag = self._variant(encoding)
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype=self.mimetype)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = self.cache_control
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
+
+    def serve_raw(self, accept_encoding: str, if_none_match: str) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        """
+        The same response as serve, for the raw Accept-Encoding and
+        If-None-Match header values: (status, headers, body)
+        """
+        encoding = self._encoding(parse_accept_header(accept_encoding))
+        body, etag = self._variant(encoding)
+        headers = [('ETag', f'"{etag}"'), ('Cache-Control', self.cache_control), ('Vary', 'Accept-Encoding')]
+        if parse_etags(if_none_match).contains_weak(etag):
+            return 304, headers, b''
+        headers.append(('Content-Type', get_content_type(self.mimetype, 'utf-8')))
+        if encoding:
+            headers.append(('Content-Encoding', encoding))
+        return 200, headers, body
@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import List, Dict, Any
+from parser import GrootParser
+from interpreter import GrootInterpreter
+from memstats import MemoryStats
+from main import run_phases
+
+def run_file(path: str, memstats: bool = False, fixed_width: bool = False,
+             pipeline: bool = False) -> Dict[str, Any]:
+    """
+    Run one .groot file on a fresh interpreter, capturing its output.
+    status is 0 for a clean run, 1 if the program reported an error and
+    2 if the file could not be read or run. With memstats, 'memory' holds
+    the peak and retained bytes of each phase (see MemoryStats.report).
+    fixed_width runs the program in 64-bit registers (see registers.py), and
+    pipeline starts running it while the rest is still being parsed.
+    """
+    start = time.perf_counter()
+    result = {'file': path, 'status': 0, 'output': '', 'error': None}
+    try:
+        with open(path, 'r') as file:
+            code = file.read()
+    except OSError as e:
+        result.update(status=2, error=f"cannot read '{path}': {e.strerror}")
+        result['seconds'] = time.perf_counter() - start
+        return result
+
+    output = []
+    interpreter = GrootInterpreter(fixed_width=fixed_width, output=output.append)
+    stats = MemoryStats() if memstats else None
+    try:
+        run_phases(code, GrootParser(), interpreter, memstats=stats, pipeline=pipeline)
+        if interpreter.errors_reported:
+            result['status'] = 1
+    except Exception as e:
+        result.update(status=2, error=f"syntax error: {e}")
+    if stats:
+        result['memory'] = stats.report()
+    result['output'] = ''.join(f"{line}\n" for line in output)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+def run_parallel(paths: List[str], jobs: int = 0, jsonl: bool = False, memstats: bool = False,
+                 fixed_width: bool = False, pipeline: bool = False) -> int:
+    """
+    Run many files across a process pool, one fresh interpreter per file.
+    Results are printed in input order as they complete (plain text with a
+    header per file, or one JSON object per line), followed by a summary on
+    stderr. Returns the worst per-file status.
+    """
+    run = partial(run_file, memstats=memstats, fixed_width=fixed_width, pipeline=pipeline)
+    jobs = jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    counts = {0: 0, 1: 0, 2: 0}
+    busy = 0.0
+
+    if jobs == 1:
+        results = map(run, paths)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=jobs)
+        # Batch small files so scheduling overhead does not dominate
+        chunksize = max(1, len(paths) // (jobs * 8))
+        results = pool.map(run, paths, chunksize=chunksize)
+    try:
+        for result in results:
+            counts[result['status']] += 1
+            busy += result['seconds']
+            if jsonl:
+                print(json.dumps(result))
+            else:
+                print(f"==> {result['file']} ({result['seconds'] * 1000:.1f}ms) <==")
+                sys.stdout.write(result['output'])
+                if result['error']:
+                    print(f"Error: {result['error']}", file=sys.stderr)
+                if 'memory' in result:
+                    print_memory(result['memory'])
+    finally:
+        if pool:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - start
+    rate = len(paths) / elapsed if elapsed else 0.0
+    print(f"{len(paths)} files: {counts[0]} ok, {counts[1]} reported errors, {counts[2]} failed; "
+          f"{elapsed:.2f}s wall, {busy:.2f}s in files, {rate:.1f} files/s on {jobs} workers",
+          file=sys.stderr)
+    return max(status for status, count in counts.items() if count) if paths else 0
+
+def print_memory(memory: Dict[str, Any]):
+    """Per-phase memory of one file, on stderr next to the summary"""
+    statements = memory['statements']
+    for phase, stats in memory['phases'].items():
+        print(f"  {phase:<10} peak {stats['peak']:>12,}B  retained {stats['retained']:>12,}B  "
+              f"({stats['peak_per_statement']:.1f}B peak per statement over {statements})", file=sys.stderr)
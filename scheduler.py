@@ -0,0 +1,157 @@
+import math
+import threading
+import time
+from bisect import insort
+from contextlib import contextmanager
+from typing import Dict, Any, List
+
+# Static cost weights, in units of one simple statement
+PRINT_COST = 4          # formatting and shipping the value back
+CALL_COST = 2           # state copy and dispatch on top of the body
+RECURSION_COST = 10_000 # a recursive call may run until the recursion limit
+
+# Requests up to this cost are interactive; costlier ones share fewer slots
+CHEAP_COST = 10_000
+# Estimated work (running plus waiting) past which requests are turned away
+MAX_QUEUED_COST = 5_000_000
+MAX_WAITING = 64
+# Starting guess for cost units executed per second, refined as requests finish
+INITIAL_RATE = 500_000.0
+
+def estimate_cost(ast: Dict[str, Any], functions: Dict[int, Dict[str, Any]] = None) -> int:
+    """
+    Static cost of running a program once: statements weighted by their kind,
+    with every call charged the cost of the body it runs.
+    functions adds declarations from earlier runs that the program may call.
+    """
+    table = dict(functions or {})
+    table.update(ast.get('functions', {}))
+    function_costs = {}
+
+    def function_cost(name: int) -> int:
+        if name not in table:
+            return 1
+        if name not in function_costs:
+            # Seen again before it is known: the function is recursive
+            function_costs[name] = RECURSION_COST
+            body = []
+            for stmt in table[name]['body']:
+                if stmt['type'] == 'RETURN':
+                    break
+                body.append(stmt)
+            function_costs[name] = CALL_COST + block_cost(body)
+        return function_costs[name]
+
+    def block_cost(statements: List[Dict[str, Any]]) -> int:
+        cost = 0
+        for stmt in statements:
+            stype = stmt['type']
+            if stype == 'PRINT':
+                cost += PRINT_COST
+            elif stype in ('FUNCTION_CALL', 'FUNC_ASSIGN'):
+                cost += function_cost(stmt['function'])
+            elif stype == 'TRY_CATCH':
+                cost += 1 + block_cost(stmt['try_body']) + block_cost(stmt['catch_body'])
+            else:
+                cost += 1
+        return cost
+
+    return block_cost(ast['statements'])
+
+class Overloaded(Exception):
+    """Raised when a request would push queued work past the limit"""
+    def __init__(self, retry_after: int):
+        super().__init__(f"server busy, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+class Scheduler:
+    """
+    Admission control for program runs.
+    Each run is admitted with its estimated cost and waits for one of `slots`
+    execution slots; waiting runs start in order of arrival time plus their
+    expected run time, so cheap runs overtake expensive ones without starving
+    them. Expensive runs may only take `expensive_slots` of the slots, so a
+    burst of large programs cannot hold up interactive ones. When the estimated
+    work already queued passes max_queued_cost, further runs are rejected with
+    a retry hint.
+    """
+    def __init__(self, slots: int = 8, expensive_slots: int = 1, cheap_cost: int = CHEAP_COST,
+                 max_queued_cost: int = MAX_QUEUED_COST, max_waiting: int = MAX_WAITING):
+        self.slots = slots
+        self.expensive_slots = expensive_slots
+        self.cheap_cost = cheap_cost
+        self.max_queued_cost = max_queued_cost
+        self.max_waiting = max_waiting
+        self.condition = threading.Condition()
+        # Waiting runs as [priority, sequence, cost], kept sorted
+        self.waiting: List[list] = []
+        self.sequence = 0
+        self.running = 0
+        self.running_expensive = 0
+        self.queued_cost = 0
+        self.rejected = 0
+        self.rate = INITIAL_RATE
+
+    def retry_after(self, cost: int) -> int:
+        """Seconds until enough queued work has drained to admit cost"""
+        excess = self.queued_cost + cost - self.max_queued_cost
+        return max(1, math.ceil(max(excess, cost) / self.rate))
+
+    def reject(self, cost: int = 0) -> Overloaded:
+        """Count a run turned away before it reached admit; returns the error to raise"""
+        with self.condition:
+            self.rejected += 1
+            return Overloaded(self.retry_after(cost))
+
+    @contextmanager
+    def admit(self, cost: int):
+        """
+        Run the enclosed block once a slot is free and it is this run's turn.
+        Raises Overloaded, before running anything, if the queue is full.
+        A run arriving at an empty queue is always admitted, whatever its cost.
+        """
+        with self.condition:
+            if self.queued_cost and (self.queued_cost + cost > self.max_queued_cost
+                                     or len(self.waiting) >= self.max_waiting):
+                self.rejected += 1
+                raise Overloaded(self.retry_after(cost))
+            self.sequence += 1
+            ticket = [time.monotonic() + cost / self.rate, self.sequence, cost]
+            insort(self.waiting, ticket)
+            self.queued_cost += cost
+            while not self._can_start(ticket):
+                self.condition.wait()
+            self.waiting.remove(ticket)
+            expensive = cost > self.cheap_cost
+            self.running += 1
+            self.running_expensive += expensive
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.condition:
+                self.running -= 1
+                self.running_expensive -= expensive
+                self.queued_cost -= cost
+                if expensive and elapsed > 0:
+                    # Moving average of the observed rate on runs long enough to time
+                    self.rate = 0.8 * self.rate + 0.2 * (cost / elapsed)
+                self.condition.notify_all()
+
+    def _can_start(self, ticket: list) -> bool:
+        """Whether ticket is among the waiting runs that fit in the free slots"""
+        free = self.slots - self.running
+        expensive_free = self.expensive_slots - self.running_expensive
+        for waiting in self.waiting:
+            if free <= 0:
+                return False
+            if waiting[2] > self.cheap_cost:
+                if expensive_free <= 0:
+                    continue
+                expensive_free -= 1
+            if waiting is ticket:
+                return True
+            free -= 1
+        return False
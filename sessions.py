@@ -0,0 +1,85 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+from incremental import IncrementalParser
+
+# Sessions whose program caches are kept at most
+MAX_SESSIONS = 256
+# Source lines cached across all sessions; a 20k-line program holds ~12 MiB
+MAX_LINES = 200_000
+
+class ProgramCache:
+    """Everything kept between requests about one session's program"""
+    def __init__(self):
+        self.parser = IncrementalParser()
+        # (ast, estimated cost) of the last program run
+        self.cost: Optional[Tuple[dict, int]] = None
+        # (ast, StateIndex) of the last program queried with /state-at
+        self.state_index: Optional[Tuple[dict, Any]] = None
+        # Source lines held by the parser, as last weighed
+        self.lines = 0
+
+class SessionCaches:
+    """
+    Least-recently-used program caches, bounded both by the number of
+    sessions and by the source lines they hold in total. An evicted session
+    loses its parser and every cache built from its program at once; its
+    next request starts again from a full parse. A session may be evicted
+    while a request still uses its caches; the lock that keeps the session's
+    requests in order lives with its interpreter, which is never evicted.
+    on_evict(session_id) is called for each eviction, so caches kept
+    elsewhere (such as the interpreter's rewritten program) go too.
+    """
+    def __init__(self, max_sessions: int = MAX_SESSIONS, max_lines: int = MAX_LINES,
+                 on_evict: Callable[[str], None] = None):
+        self.max_sessions = max_sessions
+        self.max_lines = max_lines
+        self.on_evict = on_evict
+        self.lock = threading.Lock()
+        self.entries: 'OrderedDict[str, ProgramCache]' = OrderedDict()
+        self.lines = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, session_id: str) -> ProgramCache:
+        """The session's caches, created if needed, marked most recently used"""
+        with self.lock:
+            entry = self.entries.get(session_id)
+            if entry is None:
+                entry = self.entries[session_id] = ProgramCache()
+            else:
+                self.entries.move_to_end(session_id)
+            evicted = self._evict(keep=session_id)
+        self._notify(evicted)
+        return entry
+
+    def weigh(self, session_id: str):
+        """Recount the session's cached lines after its program changed"""
+        with self.lock:
+            entry = self.entries.get(session_id)
+            if entry is None:
+                return
+            lines = len(entry.parser.lines)
+            self.lines += lines - entry.lines
+            entry.lines = lines
+            evicted = self._evict(keep=session_id)
+        self._notify(evicted)
+
+    def _evict(self, keep: str) -> list:
+        """Drop least recently used sessions until within bounds, sparing the one in use"""
+        evicted = []
+        while len(self.entries) > self.max_sessions or self.lines > self.max_lines:
+            session_id = next(iter(self.entries))
+            if session_id == keep:
+                break
+            self.lines -= self.entries.pop(session_id).lines
+            evicted.append(session_id)
+        self.evicted += len(evicted)
+        return evicted
+
+    def _notify(self, evicted: list):
+        if self.on_evict:
+            for session_id in evicted:
+                self.on_evict(session_id)
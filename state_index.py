@@ -0,0 +1,181 @@
+from bisect import bisect_right
+from typing import Dict, Any, Optional, Tuple
+from interpreter import GrootInterpreter
+from incremental import IncrementalParser
+
+# Variable slots used by the affine maps
+SLOTS = {'GROOT': 0, 'groot': 1}
+
+# An affine map (a, b, c, d, e, f) sends (GROOT, groot) to
+# (a*GROOT + b*groot + e, c*GROOT + d*groot + f)
+IDENTITY = (1, 0, 0, 1, 0, 0)
+
+# Guards a composed segment may carry. Past this it becomes None and queries
+# descend into its halves, so the index stays linear in the program's size
+MAX_GUARDS = 16
+
+class _ProgramHalted(Exception):
+    """Raised when a fallback statement aborts the whole program"""
+    def __init__(self, state: Tuple[int, int]):
+        super().__init__()
+        self.state = state
+
+def _compose(first: Optional[tuple], second: Optional[tuple]) -> Optional[tuple]:
+    """
+    Compose two segments (map, guards): run first, then second.
+    Guards (p, q, r) mean p*GROOT + q*groot + r >= 0 on the segment input.
+    None marks a segment that can only be executed.
+    """
+    if first is None or second is None:
+        return None
+    (a1, b1, c1, d1, e1, f1), guards1 = first
+    (a2, b2, c2, d2, e2, f2), guards2 = second
+    combined = (
+        a2 * a1 + b2 * c1, a2 * b1 + b2 * d1,
+        c2 * a1 + d2 * c1, c2 * b1 + d2 * d1,
+        a2 * e1 + b2 * f1 + e2, c2 * e1 + d2 * f1 + f2
+    )
+    # Pull the second segment's guards back onto the first segment's input
+    bounds = dict(guards1)
+    for (p, q), r in guards2:
+        key = (p * a1 + q * c1, p * b1 + q * d1)
+        value = p * e1 + q * f1 + r
+        # Variables never go negative, so guards with no negative terms always hold
+        if key[0] >= 0 and key[1] >= 0 and value >= 0:
+            continue
+        if key not in bounds or value < bounds[key]:
+            bounds[key] = value
+    if len(bounds) > MAX_GUARDS:
+        return None
+    return combined, tuple(bounds.items())
+
+def _assign_row(var: str, row: Tuple[int, int], offset: int = 0) -> tuple:
+    """Map that overwrites var with row . (GROOT, groot) + offset"""
+    if SLOTS[var] == 0:
+        return (row[0], row[1], 0, 1, offset, 0)
+    return (1, 0, row[0], row[1], 0, offset)
+
+def _unit(var: str) -> Tuple[int, int]:
+    return (1, 0) if SLOTS[var] == 0 else (0, 1)
+
+class StateIndex:
+    """
+    Answers "what are GROOT and groot after line N" without re-running the program.
+    Between side effects every statement is an affine map on (GROOT, groot)
+    guarded by non-negativity checks, so a segment tree of composed maps gives
+    any prefix state in O(log n). Segments whose guards fail or would pile up
+    past MAX_GUARDS, and statements that are not affine (try/catch,
+    recursive calls), fall back to execution.
+    """
+    def __init__(self, parser: IncrementalParser):
+        ast = parser.ast
+        self.functions = ast['functions']
+        # Top-level statements with the source line each one starts on
+        self.statements = list(ast['statements'])
+        self.lines = parser.statement_lines()
+
+        self.size = 1
+        while self.size < len(self.statements):
+            self.size *= 2
+        leaf = (IDENTITY, ())
+        self.tree = [leaf] * (2 * self.size)
+        for i, stmt in enumerate(self.statements):
+            self.tree[self.size + i] = self._statement_segment(stmt)
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = _compose(self.tree[2 * node], self.tree[2 * node + 1])
+
+    @classmethod
+    def from_code(cls, code: str) -> 'StateIndex':
+        """Build an index straight from source code"""
+        parser = IncrementalParser()
+        parser.tokenize(code)
+        return cls(parser)
+
+    def state_at(self, line: int, initial: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """
+        Get the variables after every top-level statement that starts on or
+        before line (1-based). Blocks count as a whole.
+        """
+        initial = initial or {'GROOT': 0, 'groot': 0}
+        state = (initial['GROOT'], initial['groot'])
+        count = bisect_right(self.lines, line)
+        if count:
+            try:
+                state = self._apply(1, 0, self.size, count, state)
+            except _ProgramHalted as halted:
+                state = halted.state
+        return {'GROOT': state[0], 'groot': state[1]}
+
+    def _apply(self, node: int, lo: int, hi: int, count: int, state: Tuple[int, int]) -> Tuple[int, int]:
+        """Run statements [lo, min(hi, count)) of a tree node on state"""
+        segment = self.tree[node]
+        if count >= hi and segment is not None:
+            (a, b, c, d, e, f), guards = segment
+            G, g = state
+            if all(p * G + q * g + r >= 0 for (p, q), r in guards):
+                return (a * G + b * g + e, c * G + d * g + f)
+        if hi - lo == 1:
+            return self._execute(lo, state)
+        mid = (lo + hi) // 2
+        state = self._apply(2 * node, lo, mid, count, state)
+        if count > mid:
+            state = self._apply(2 * node + 1, mid, hi, count, state)
+        return state
+
+    def _execute(self, position: int, state: Tuple[int, int]) -> Tuple[int, int]:
+        """Fallback: execute one top-level statement on a scratch interpreter"""
+        # Anything it prints is dropped
+        interpreter = GrootInterpreter(output=lambda line: None)
+        interpreter.variables = {'GROOT': state[0], 'groot': state[1]}
+        interpreter.functions = self.functions
+        try:
+            interpreter._execute_statement(self.statements[position])
+        except Exception:
+            # interpret() stops the program on unexpected runtime errors,
+            # keeping whatever the statement changed before it failed
+            state = (interpreter.variables['GROOT'], interpreter.variables['groot'])
+            raise _ProgramHalted(state)
+        return (interpreter.variables['GROOT'], interpreter.variables['groot'])
+
+    def _statement_segment(self, stmt: Dict[str, Any]) -> Optional[tuple]:
+        """Affine map and guards for one statement, or None if it must be executed"""
+        stype = stmt['type']
+        if stype == 'INCREMENT':
+            return _assign_row(stmt['variable'], _unit(stmt['variable']), 1), ()
+        elif stype == 'DECREMENT':
+            return _assign_row(stmt['variable'], _unit(stmt['variable']), -1), ((_unit(stmt['variable']), -1),)
+        elif stype == 'ASSIGN':
+            return _assign_row(stmt['left'], _unit(stmt['right'])), ()
+        elif stype == 'ADD':
+            left, right = _unit(stmt['left']), _unit(stmt['right'])
+            return _assign_row(stmt['left'], (left[0] + right[0], left[1] + right[1])), ()
+        elif stype == 'SUBTRACT':
+            left, right = _unit(stmt['left']), _unit(stmt['right'])
+            row = (left[0] - right[0], left[1] - right[1])
+            return _assign_row(stmt['left'], row), ((row, 0),)
+        elif stype in ('FUNCTION_CALL', 'FUNC_ASSIGN'):
+            function = self.functions.get(stmt['function'])
+            if function is None:
+                # Calling an undefined function only reports an error
+                return IDENTITY, ()
+            segment, returned = self._function_segment(function)
+            if stype == 'FUNC_ASSIGN':
+                row = _unit(returned) if returned else (0, 0)
+                segment = _compose(segment, (_assign_row(stmt['variable'], row), ()))
+            return segment
+        elif stype == 'TRY_CATCH':
+            return None
+        # PRINT and top-level RETURN leave the variables alone
+        return IDENTITY, ()
+
+    def _function_segment(self, function: Dict[str, Any]) -> Tuple[Optional[tuple], Optional[str]]:
+        """Compose the function body up to its RETURN; returns (segment, returned variable)"""
+        segment = (IDENTITY, ())
+        for stmt in function['body']:
+            if stmt['type'] == 'RETURN':
+                return segment, stmt['variable']
+            if stmt['type'] in ('FUNCTION_CALL', 'FUNC_ASSIGN'):
+                # Nested and recursive calls are left to the interpreter
+                return None, None
+            segment = _compose(segment, self._statement_segment(stmt))
+        return segment, None
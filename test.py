@@ -1,9 +1,90 @@
 """
-Unit tests for basic tokenization functionality in the Groot language parser.
-Each test checks a single Groot statement and compares the token type output.
+Unit tests for the Groot language parser and interpreter.
+Most tests check a single Groot statement and compare the token type output;
+the later ones check short programs and the modules around the interpreter
+(state index, scheduler, trace recorder and both web front ends).
 """
 
+import asyncio
+import gzip
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
 from parser import GrootParser
+from incremental import IncrementalParser
+from interpreter import GrootInterpreter
+from analysis import RangeAnalysis
+from pipeline import pipelined
+from state_index import StateIndex, MAX_GUARDS
+import asgi
+from app import app as web_app, index_response, scheduler
+from recorder import TraceRecorder, TraceReplay
+from scheduler import Scheduler, Overloaded, estimate_cost, PRINT_COST, CALL_COST, RECURSION_COST
+
+def run_program(code, runs=1, **options):
+    """
+    Run code on a fresh interpreter, from a reset state each time (range
+    analysis only starts on a re-run); returns (last run's output, interpreter)
+    """
+    interpreter = GrootInterpreter(**options)
+    ast = GrootParser().parse(GrootParser().tokenize(code))
+    for _ in range(runs):
+        interpreter.reset()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            interpreter.interpret(ast)
+    return output.getvalue(), interpreter
+
+def run_prefix(code, count, initial):
+    """Variables after running the first count top-level statements of code from initial"""
+    ast = GrootParser().parse(GrootParser().tokenize(code))
+    interpreter = GrootInterpreter(output=lambda line: None)
+    interpreter.variables = dict(initial)
+    interpreter.interpret({'statements': ast['statements'][:count], 'functions': ast['functions']})
+    return interpreter.get_variable_state()
+
+def run_traced(code, recorder):
+    """Run code on a fresh interpreter recording into recorder; returns the recorder"""
+    interpreter = GrootInterpreter(trace=recorder, output=lambda line: None)
+    interpreter.interpret(GrootParser().parse(GrootParser().tokenize(code)))
+    return recorder
+
+def asgi_request(method, path, body=b'', headers=()):
+    """Send one request through asgi.application in process; returns (status, headers, body)"""
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+    async def send(message):
+        sent.append(message)
+    scope = {'type': 'http', 'method': method, 'path': path,
+             'headers': [(name.lower().encode(), value.encode()) for name, value in headers]}
+    asyncio.run(asgi.application(scope, receive, send))
+    return sent[0]['status'], {name.decode(): value.decode() for name, value in sent[0]['headers']}, sent[1]['body']
+
+def admit_in_thread(scheduler, cost, name, started, release):
+    """Run under scheduler.admit(cost) on a thread, noting name once admitted and holding the slot until release is set"""
+    def run():
+        try:
+            with scheduler.admit(cost):
+                started.append(name)
+                release.wait(5)
+        except Overloaded:
+            started.append(f"{name} rejected")
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+def wait_until(condition, timeout=5):
+    """Poll condition until it holds or timeout seconds pass"""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return condition()
 
 def run_tests():
     parser = GrootParser()
@@ -113,6 +194,314 @@ def run_tests():
     print(f"Got:      {[t.type for t in result13]}")
     print(f"Status:   {'\u2713 PASS' if [t.type for t in result13] == expected13 else '\u2717 FAIL'}\n")
 
+    # Test 14: Incremental re-parse after edits
+    print("Test 14: IncrementalParser edits match a full parse")
+    program14 = "I am... Groot,\n    I am GROOT!\n    I am groot.\nI am... Groot\nI am groot"
+    edits14 = [
+        program14.replace("I am... Groot\n", "I am groot? I am GROOT\nI am... Groot\n"),
+        program14.replace("    I am GROOT!", "    I am groot?"),
+    ]
+    incremental14 = IncrementalParser()
+    incremental14.parse(incremental14.tokenize(program14))
+    # The statement list is patched in place, so compare after each edit
+    result14 = [incremental14.parse(incremental14.tokenize(code)) == GrootParser().parse(GrootParser().tokenize(code))
+                for code in edits14]
+    expected14 = [True, True]
+    print(f"Expected: {expected14}")
+    print(f"Got:      {result14}")
+    print(f"Status:   {'\u2713 PASS' if result14 == expected14 else '\u2717 FAIL'}\n")
+
+    # Test 15: Range analysis rewrites a decrement only when it is proven safe
+    print("Test 15: RangeAnalysis on 'I am GROOT!', 'I am GROOT?', 'I am GROOT?'")
+    ast15 = parser.parse(parser.tokenize("I am GROOT!\nI am GROOT?\nI am GROOT?"))
+    result15 = [stmt['type'] for stmt in RangeAnalysis({}).optimize(ast15['statements'])]
+    expected15 = ['INCREMENT', 'DECREMENT_UNCHECKED', 'DECREMENT']
+    print(f"Expected: {expected15}")
+    print(f"Got:      {result15}")
+    print(f"Status:   {'\u2713 PASS' if result15 == expected15 else '\u2717 FAIL'}\n")
+
+    # Test 16: A try/catch that cannot fail is lowered and prints the same rocket line
+    print("Test 16: lowered try/catch output on a re-run matches the first and unoptimized runs")
+    program16 = "I am groot!\nI am groot!\nI am Groot???\n    I am groot?\n    I am Groot!!!\n    I am Groot!!!.\nI am groot"
+    output16, interpreter16 = run_program(program16, runs=2)
+    lowered16 = [stmt['type'] for stmt in interpreter16._optimized[2]]
+    result16 = ['SUCCESS_OUTPUT' in lowered16, output16, run_program(program16)[0],
+                run_program(program16, optimize=False)[0]]
+    expected16 = [True, 'rocket: "1"\n1\n', 'rocket: "1"\n1\n', 'rocket: "1"\n1\n']
+    print(f"Expected: {expected16}")
+    print(f"Got:      {result16}")
+    print(f"Status:   {'\u2713 PASS' if result16 == expected16 else '\u2717 FAIL'}\n")
+
+    # Test 17: A REPL run that starts inside a try block skips the rewrite
+    print("Test 17: interpreter left with in_try_catch set does not optimize")
+    interpreter17 = GrootInterpreter()
+    interpreter17.in_try_catch = True
+    with redirect_stdout(io.StringIO()) as output17:
+        interpreter17.interpret(parser.parse(parser.tokenize("I am GROOT!\nI am GROOT?\nI am GROOT")))
+    result17 = [interpreter17._optimized, output17.getvalue()]
+    expected17 = [None, '0\n']
+    print(f"Expected: {expected17}")
+    print(f"Got:      {result17}")
+    print(f"Status:   {'\u2713 PASS' if result17 == expected17 else '\u2717 FAIL'}\n")
+
+    # Test 18: Functions are named by their dot count
+    print("Test 18: tokenize('I am.... Groot,')")
+    result18 = [(t.type, t.value) for t in parser.tokenize("I am.... Groot,")]
+    expected18 = [('FUNCTION_DECL', '4')]
+    print(f"Expected: {expected18}")
+    print(f"Got:      {result18}")
+    print(f"Status:   {'\u2713 PASS' if result18 == expected18 else '\u2717 FAIL'}\n")
+
+    # Test 19: Function assignment carries the variable and the function name
+    print("Test 19: tokenize('I am groot, I am.... Groot')")
+    result19 = [(t.type, t.value) for t in parser.tokenize("I am groot, I am.... Groot")]
+    expected19 = [('FUNC_ASSIGN', 'groot,4')]
+    print(f"Expected: {expected19}")
+    print(f"Got:      {result19}")
+    print(f"Status:   {'\u2713 PASS' if result19 == expected19 else '\u2717 FAIL'}\n")
+
+    # Test 20: Declaring a name again replaces the earlier function
+    print("Test 20: redeclared 'I am... Groot,' runs the later body")
+    program20 = ("I am... Groot,\n    I am GROOT!\n    I am GROOT.\n"
+                 "I am... Groot,\n    I am groot!\n    I am groot.\n"
+                 "I am groot, I am... Groot\nI am GROOT\nI am groot")
+    ast20 = parser.parse(parser.tokenize(program20))
+    result20 = [list(ast20['functions']), run_program(program20)[0]]
+    expected20 = [[3], '0\n1\n']
+    print(f"Expected: {expected20}")
+    print(f"Got:      {result20}")
+    print(f"Status:   {'\u2713 PASS' if result20 == expected20 else '\u2717 FAIL'}\n")
+
+    # Test 21: Fixed-width registers fall back to Python ints on overflow
+    print("Test 21: doubling GROOT 70 times with fixed_width=True")
+    program21 = "I am GROOT!\n" + "I am GROOT! I am GROOT\n" * 70 + "I am GROOT\nI am GROOT?\nI am GROOT"
+    result21 = run_program(program21, fixed_width=True)[0]
+    expected21 = f"{2 ** 70}\n{2 ** 70 - 1}\n"
+    print(f"Expected: {expected21!r}")
+    print(f"Got:      {result21!r}")
+    print(f"Status:   {'\u2713 PASS' if result21 == expected21 else '\u2717 FAIL'}\n")
+
+    # Test 22: Pipelined tokenize/parse/execute prints what a sequential run does
+    print("Test 22: pipelined run in 2-line pieces matches interpret()")
+    program22 = ("I am GROOT!\nI am groot, I am... Groot\nI am groot\nI am GROOT?\nI am GROOT?\n"
+                 "I am groot! I am GROOT\nI am groot\nI am... Groot,\n    I am GROOT!\n    I am GROOT.")
+    interpreter22 = GrootInterpreter()
+    with redirect_stdout(io.StringIO()) as output22:
+        interpreter22.interpret_stream(pipelined(program22, chunk_lines=2))
+    result22 = [output22.getvalue(), interpreter22.get_variable_state()]
+    sequential22 = run_program(program22)
+    expected22 = [sequential22[0], sequential22[1].get_variable_state()]
+    print(f"Expected: {expected22}")
+    print(f"Got:      {result22}")
+    print(f"Status:   {'\u2713 PASS' if result22 == expected22 else '\u2717 FAIL'}\n")
+
+    # Test 23: StateIndex answers what running each prefix of the program leaves
+    print("Test 23: StateIndex.state_at matches running the first k statements")
+    programs23 = [
+        # Failing guards (a decrement and a subtraction at 0) fall back to execution
+        ("I am GROOT?\nI am groot!\nI am GROOT? I am groot\nI am GROOT!\nI am GROOT", {'GROOT': 0, 'groot': 0}),
+        # FUNC_ASSIGN composes the function body with the assignment
+        ("I am... Groot,\n    I am GROOT!\n    I am groot! I am GROOT\n    I am groot.\n"
+         "I am groot, I am... Groot\nI am GROOT, I am... Groot\nI am groot? I am GROOT", {'GROOT': 0, 'groot': 0}),
+        # Try/catch leaves are always executed
+        ("I am GROOT!\nI am Groot???\n    I am GROOT?\n    I am GROOT?\n    I am Groot!!!\n    I am groot!\n"
+         "I am GROOT!\nI am Groot???\n    I am groot!\n    I am Groot!!!\n    I am Groot!!!.", {'GROOT': 0, 'groot': 0}),
+        # Each doubling pulls the next decrement's guard back to a new one, past MAX_GUARDS
+        ("\n".join(["I am GROOT! I am GROOT", "I am GROOT?"] * (MAX_GUARDS + 1)), {'GROOT': 2, 'groot': 0}),
+    ]
+    result23 = []
+    for code, initial in programs23:
+        index23 = StateIndex.from_code(code)
+        # Ask for both the line a statement starts on and the last line before the next one
+        ends23 = [line - 1 for line in index23.lines[1:]] + [code.count('\n') + 1]
+        result23.append(all(
+            index23.state_at(start, initial) == index23.state_at(end, initial) == run_prefix(code, k + 1, initial)
+            for k, (start, end) in enumerate(zip(index23.lines, ends23))
+        ) and index23.state_at(0, initial) == initial)
+    # The try/catch program and the guard-heavy one each leave segments to execute
+    result23 += [None in StateIndex.from_code(programs23[2][0]).tree, None in StateIndex.from_code(programs23[3][0]).tree]
+    expected23 = [True, True, True, True, True, True]
+    print(f"Expected: {expected23}")
+    print(f"Got:      {result23}")
+    print(f"Status:   {'\u2713 PASS' if result23 == expected23 else '\u2717 FAIL'}\n")
+
+    # Test 24: Admission control orders, limits and rejects runs by cost
+    print("Test 24: Scheduler.admit overtaking, expensive slots, rejection and estimate_cost")
+    result24 = []
+    # One slot, held: a cheap run queued after an expensive one starts first
+    scheduler24, started24, hold24, release24 = Scheduler(slots=1), [], threading.Event(), threading.Event()
+    threads24 = [admit_in_thread(scheduler24, 1, 'holder', started24, hold24)]
+    wait_until(lambda: started24 == ['holder'])
+    threads24.append(admit_in_thread(scheduler24, 1_000_000, 'expensive', started24, release24))
+    wait_until(lambda: len(scheduler24.waiting) == 1)
+    threads24.append(admit_in_thread(scheduler24, 10, 'cheap', started24, release24))
+    wait_until(lambda: len(scheduler24.waiting) == 2)
+    hold24.set()
+    release24.set()
+    for thread in threads24:
+        thread.join()
+    result24.append(started24)
+    # Free slots are left unused rather than given to a second expensive run
+    scheduler24, started24, release24 = Scheduler(slots=4, expensive_slots=1), [], threading.Event()
+    threads24 = [admit_in_thread(scheduler24, 1_000_000, 'expensive 1', started24, release24)]
+    wait_until(lambda: started24 == ['expensive 1'])
+    threads24.append(admit_in_thread(scheduler24, 1_000_000, 'expensive 2', started24, release24))
+    wait_until(lambda: len(scheduler24.waiting) == 1)
+    threads24.append(admit_in_thread(scheduler24, 10, 'cheap', started24, release24))
+    wait_until(lambda: len(started24) == 2)
+    result24.append([list(started24), scheduler24.running_expensive, len(scheduler24.waiting)])
+    release24.set()
+    for thread in threads24:
+        thread.join()
+    # Past max_queued_cost or max_waiting runs are turned away with a retry hint
+    scheduler24, started24, release24 = Scheduler(slots=1, max_queued_cost=100, max_waiting=1), [], threading.Event()
+    threads24 = [admit_in_thread(scheduler24, 60, 'holder', started24, release24)]
+    wait_until(lambda: started24 == ['holder'])
+    threads24.append(admit_in_thread(scheduler24, 50, 'too costly', started24, release24))
+    threads24.append(admit_in_thread(scheduler24, 10, 'waiting', started24, release24))
+    wait_until(lambda: len(scheduler24.waiting) == 1 and len(started24) == 2)
+    try:
+        with scheduler24.admit(10):
+            pass
+        retry24 = None
+    except Overloaded as e:
+        retry24 = e.retry_after
+    release24.set()
+    for thread in threads24:
+        thread.join()
+    result24.append([started24, retry24 is not None and retry24 >= 1, scheduler24.rejected])
+    # An empty queue admits a run of any cost
+    with Scheduler(max_queued_cost=100).admit(10 ** 9):
+        result24.append('admitted')
+    # Prints and calls are weighted; a recursive call is charged RECURSION_COST
+    ast24 = parser.parse(parser.tokenize("I am... Groot,\n    I am GROOT!\n    I am GROOT.\n"
+                                         "I am.... Groot,\n    I am.... Groot\nI am GROOT!\nI am groot\nI am... Groot"))
+    recursive24 = parser.parse(parser.tokenize("I am.... Groot,\n    I am.... Groot\nI am.... Groot"))
+    result24.append([estimate_cost(ast24), estimate_cost(recursive24) >= RECURSION_COST])
+    expected24 = [
+        ['holder', 'cheap', 'expensive'],
+        [['expensive 1', 'cheap'], 1, 1],
+        [['holder', 'too costly rejected', 'waiting'], True, 2],
+        'admitted',
+        [1 + PRINT_COST + CALL_COST + 1, True],
+    ]
+    print(f"Expected: {expected24}")
+    print(f"Got:      {result24}")
+    print(f"Status:   {'\u2713 PASS' if result24 == expected24 else '\u2717 FAIL'}\n")
+
+    # Test 25: Traces keep the last records, big values and statement positions
+    print("Test 25: TraceRecorder ring, overflow table, sampling and file round trip")
+    result25 = []
+    # Six records in a ring of four keep the last four; the repeated lines stay apart
+    replay25 = TraceReplay.from_recorder(run_traced("I am GROOT!\nI am GROOT!\nI am groot?\nI am GROOT!\nI am GROOT!\nI am GROOT",
+                                                    TraceRecorder(capacity=4)))
+    result25.append([(r['index'], r['position'], r['statement'], r['GROOT'], r['error']) for r in replay25.records])
+    # Values past 64 bits live in the side table, only for records still in the ring
+    program25 = "I am GROOT!\n" + "I am GROOT! I am GROOT\n" * 70
+    recorder25 = run_traced(program25, TraceRecorder(capacity=4))
+    result25.append([sorted(recorder25.overflow), [r['GROOT'] for r in TraceReplay.from_recorder(recorder25).records]])
+    # Sampling every second statement still keeps every error
+    replay25 = TraceReplay.from_recorder(run_traced("I am GROOT!\nI am groot?\nI am groot?\nI am GROOT!\nI am GROOT!",
+                                                    TraceRecorder(sample_every=2)))
+    result25.append([(r['position'], r['error']) for r in replay25.records])
+    # A file-backed trace reads back the same records, with source lines
+    lines25 = [1] + list(range(3, 73))
+    with tempfile.TemporaryDirectory() as directory:
+        path25 = os.path.join(directory, 'program.trace')
+        recorder25 = run_traced(program25.replace("\n", "\n\n", 1), TraceRecorder(capacity=4, path=path25))
+        records25 = TraceReplay.from_recorder(recorder25, lines25).records
+        recorder25.close(lines25)
+        result25.append(TraceReplay.from_file(path25).records == records25)
+    result25.append([(r['line'], r['GROOT']) for r in records25])
+    expected25 = [
+        [(2, 2, 'I am groot?', 2, True), (3, 3, 'I am GROOT!', 3, False),
+         (4, 4, 'I am GROOT!', 4, False), (5, 5, 'I am GROOT', 4, False)],
+        [[67, 68, 69, 70], [2 ** 67, 2 ** 68, 2 ** 69, 2 ** 70]],
+        [(1, True), (2, True), (3, False)],
+        True,
+        [(69, 2 ** 67), (70, 2 ** 68), (71, 2 ** 69), (72, 2 ** 70)],
+    ]
+    print(f"Expected: {expected25}")
+    print(f"Got:      {result25}")
+    print(f"Status:   {'\u2713 PASS' if result25 == expected25 else '\u2717 FAIL'}\n")
+
+    # Test 26: Precomputed pages negotiate gzip and revalidate per encoding
+    print("Test 26: PrecomputedResponse gzip negotiation, ETags and 304 through the test client")
+    client26 = web_app.test_client()
+    plain26 = client26.get('/')
+    gzipped26 = client26.get('/', headers={'Accept-Encoding': 'gzip'})
+    refused26 = client26.get('/', headers={'Accept-Encoding': 'gzip;q=0'})
+    result26 = [
+        [plain26.status_code, plain26.headers.get('Content-Encoding'), plain26.headers['Vary']],
+        [gzipped26.status_code, gzipped26.headers['Content-Encoding'], gzip.decompress(gzipped26.data) == plain26.data],
+        refused26.headers.get('Content-Encoding'),
+        # Strong ETags, one per encoding
+        [plain26.headers['ETag'].startswith('"'), gzipped26.headers['ETag'] == plain26.headers['ETag'][:-1] + '-gzip"'],
+    ]
+    # Only the ETag of the encoding being served revalidates
+    revalidated26 = client26.get('/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': gzipped26.headers['ETag']})
+    mismatched26 = client26.get('/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': plain26.headers['ETag']})
+    result26 += [[revalidated26.status_code, revalidated26.data, revalidated26.headers['ETag']], mismatched26.status_code]
+    # serve_raw answers the same for the raw header values
+    status26, headers26, body26 = index_response.serve_raw('gzip', '')
+    result26.append([status26, dict(headers26)['ETag'], body26 == gzipped26.data])
+    result26.append(index_response.serve_raw('gzip', gzipped26.headers['ETag'])[0::2])
+    expected26 = [
+        [200, None, 'Accept-Encoding'],
+        [200, 'gzip', True],
+        None,
+        [True, True],
+        [304, b'', gzipped26.headers['ETag']],
+        200,
+        [200, gzipped26.headers['ETag'], True],
+        (304, b''),
+    ]
+    print(f"Expected: {expected26}")
+    print(f"Got:      {result26}")
+    print(f"Status:   {'\u2713 PASS' if result26 == expected26 else '\u2717 FAIL'}\n")
+
+    # Test 27: The ASGI front end answers byte for byte like the Flask routes
+    print("Test 27: asgi.application matches the Flask test client on /execute, /state-at and /reset")
+    requests27 = [
+        ('/execute', json.dumps({'code': 'I am GROOT!\nI am GROOT\nI am groot?'}).encode()),
+        ('/execute', json.dumps({'code': 'I am GROOT!\nI am GROOT!\nI am GROOT'}).encode()),
+        ('/execute', json.dumps({'code': ''}).encode()),
+        ('/execute', b'{bad'),
+        ('/state-at', json.dumps({'code': '\nI am GROOT!\nI am GROOT!\nI am groot', 'line': 2}).encode()),
+        ('/state-at', json.dumps({'code': 'I am GROOT!', 'line': 'x'}).encode()),
+        ('/reset', b''),
+        ('/execute', json.dumps({'code': 'I am GROOT!\nI am GROOT?\nI am GROOT'}).encode()),
+    ]
+    client27 = web_app.test_client()
+    headers27 = [('Content-Type', 'application/json')]
+    answers27 = []
+    for path, body in requests27:
+        status, headers, asgi_body = asgi_request('POST', path, body, headers27)
+        if 'set-cookie' in headers:
+            # Later requests belong to the same session
+            headers27.append(('Cookie', headers['set-cookie'].split(';')[0]))
+        flask27 = client27.post(path, data=body, headers={'Content-Type': 'application/json'})
+        answers27.append((status, headers['content-type'], asgi_body) ==
+                         (flask27.status_code, flask27.headers['Content-Type'], flask27.get_data()))
+    result27 = [answers27, len(asgi.session_locks)]
+    # A full executor backlog turns runs away with the scheduler's 429
+    rejected27 = scheduler.rejected
+    with asgi.in_flight_lock:
+        asgi.in_flight += asgi.MAX_IN_FLIGHT
+    try:
+        busy27 = asgi_request('POST', '/execute', json.dumps({'code': 'I am GROOT!'}).encode(), headers27)
+    finally:
+        with asgi.in_flight_lock:
+            asgi.in_flight -= asgi.MAX_IN_FLIGHT
+    result27.append([busy27[0], busy27[1]['retry-after'], json.loads(busy27[2]), scheduler.rejected - rejected27, asgi.in_flight])
+    expected27 = [
+        [True] * len(requests27), 0,
+        [429, '1', {'success': False, 'error': 'Server busy: try again in 1s', 'variables': {'GROOT': 0, 'groot': 0}}, 1, 0],
+    ]
+    print(f"Expected: {expected27}")
+    print(f"Got:      {result27}")
+    print(f"Status:   {'\u2713 PASS' if result27 == expected27 else '\u2717 FAIL'}\n")
+
     # Summary of all tests
     all_tests = [
         ([t.type for t in parser.tokenize("I am groot")], ['PRINT']),
@@ -128,6 +517,20 @@ def run_tests():
         ([t.type for t in parser.tokenize("I am Groot!!!")], ['CATCH_START']),
         ([t.type for t in parser.tokenize("I am groot.")], ['RETURN']),
         ([t.type for t in parser.tokenize("I am Groot!!!.")], ['ERROR_OUTPUT']),
+        (result14, expected14),
+        (result15, expected15),
+        (result16, expected16),
+        (result17, expected17),
+        (result18, expected18),
+        (result19, expected19),
+        (result20, expected20),
+        (result21, expected21),
+        (result22, expected22),
+        (result23, expected23),
+        (result24, expected24),
+        (result25, expected25),
+        (result26, expected26),
+        (result27, expected27),
     ]
 
     passed = sum(1 for result, expected in all_tests if result == expected)